@@ -5,7 +5,7 @@ import streamlit as st
 from rag_manager import RagManager
 from ui_components import UIComponents
 from chat_handler import ChatHandler
-from logger import setup_global_logger, log_highlight
+from logger import setup_global_logger, log_highlight, new_thinking_logs
 from config import ProjectConfig
 from process_manager import ProcessManager
 
@@ -64,10 +64,7 @@ if st.session_state.get("force_rebuild"):
     # Ensure session state is properly initialized before clearing
     rag_manager.initialize_session_state()
     # Safely clear thinking logs
-    if "thinking_logs" in st.session_state:
-        st.session_state.thinking_logs.clear()
-    else:
-        st.session_state.setdefault("thinking_logs", [])
+    st.session_state.setdefault("thinking_logs", new_thinking_logs()).clear()
     
     # Protect the RAG build process
     try:
@@ -93,10 +90,7 @@ else:
         # Ensure session state is properly initialized before clearing
         rag_manager.initialize_session_state()
         # Safely clear thinking logs
-        if "thinking_logs" in st.session_state:
-            st.session_state.thinking_logs.clear()
-        else:
-            st.session_state.setdefault("thinking_logs", [])
+        st.session_state.setdefault("thinking_logs", new_thinking_logs()).clear()
         
         # Determine if this is incremental or full rebuild
         is_incremental = rebuild_info["reason"] == "files_changed" and rebuild_info["files"]
@@ -175,8 +169,7 @@ if rag_manager.is_ready():
 
     if submitted and query:
         # Ensure thinking_logs is initialized before clearing
-        st.session_state.setdefault("thinking_logs", [])
-        st.session_state.thinking_logs.clear()
+        st.session_state.setdefault("thinking_logs", new_thinking_logs()).clear()
         
         with st.chat_message("user"):
             st.markdown(query)
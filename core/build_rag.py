@@ -2,6 +2,9 @@ import os
 import re
 import time
 import json
+import weakref
+from collections import OrderedDict
+from itertools import islice
 from typing import List, Dict
 
 import streamlit as st
@@ -23,20 +26,43 @@ def chunk_fingerprint(chunk: str) -> str:
     import hashlib
     return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
 
+# Chunker output per (path, mtime_ns, size, ext, project_type), so rebuilding unchanged files in the
+# same process skips the read and the chunking; bounded, least recently used entries are evicted first
+_CHUNK_CACHE = OrderedDict()
+_CHUNK_CACHE_MAX = 1024
+
+def chunk_file(path, ext, chunker, project_type):
+    """Read and chunk a file, reusing the cached chunks while its mtime and size are unchanged."""
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size, ext, project_type)
+    chunks = _CHUNK_CACHE.get(key)
+    if chunks is not None:
+        _CHUNK_CACHE.move_to_end(key)
+        return chunks
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        content = f.read()
+    chunks = _CHUNK_CACHE[key] = list(chunker(content))
+    if len(_CHUNK_CACHE) > _CHUNK_CACHE_MAX:
+        _CHUNK_CACHE.popitem(last=False)
+    return chunks
+
+# Last log window written to each live placeholder; weak keys so placeholders from finished runs drop out,
+# and nothing unserializable goes into session state
+_rendered_log_windows = weakref.WeakKeyDictionary()
+
 def update_logs(log_placeholder):
     logs = st.session_state.get('thinking_logs', [])
     if logs:
-        recent_logs = logs[-20:]
-        formatted_logs = [f"[{i+1:02d}] {log}" for i, log in enumerate(recent_logs)]
-        log_text = "\n".join(formatted_logs)
-        with log_placeholder.container():
-            st.text_area(
-                "Live Processing Status",
-                value=log_text,
-                height=200,
-                disabled=True,
-                key=f"live_logs_{len(logs)}", label_visibility="collapsed"
-            )
+        # Only redraw when the visible 20-line window changed since this placeholder was last written;
+        # tuple equality checks element identity first, so an unchanged window compares in O(20) pointer checks
+        recent_logs = tuple(islice(logs, max(0, len(logs) - 20), None))
+        if _rendered_log_windows.get(log_placeholder) == recent_logs:
+            return
+        _rendered_log_windows[log_placeholder] = recent_logs
+        log_text = "\n".join(f"[{i:02d}] {log}" for i, log in enumerate(recent_logs, 1))
+        # A keyless code element updates in place; a text_area needs a fresh key per call (the deque's
+        # length stops changing once full, so len-based keys would collide) and remounts every time
+        log_placeholder.code(log_text, language="text")
 
 def sanitize_metadata(meta: dict) -> dict:
     return {
@@ -59,7 +85,7 @@ def build_code_relationship_map(documents: List[Document]) -> Dict[str, set]:
                 code_relationship_map.setdefault(file, set()).add(deps)
     return code_relationship_map
 
-def build_rag(project_dir, ollama_model, ollama_endpoint, log_placeholder, project_type=None, incremental=False, files_to_process=None):
+def build_rag(project_dir, ollama_model, ollama_endpoint, log_placeholder, project_type=None, incremental=False, files_to_process=None, embedding_cache_dir=None):
     # Get project configuration with centralized path management
     project_config = ProjectConfig(project_type=project_type, project_dir=project_dir)
     
@@ -116,7 +142,7 @@ def build_rag(project_dir, ollama_model, ollama_endpoint, log_placeholder, proje
     # Components
     metadata_extractor = MetadataExtractor(project_config)
     hierarchical_indexer = HierarchicalIndexer(project_config, VECTOR_DB_DIR)
-    extensions = project_config.get_extensions()
+    extensions = project_config.extensions_tuple
 
     st.info(f"🎯 Detected project type: **{project_config.project_type.upper()}**")
     if incremental:
@@ -159,6 +185,15 @@ def build_rag(project_dir, ollama_model, ollama_endpoint, log_placeholder, proje
         embedding_model = ollama_model
     
     embeddings = OllamaEmbeddings(model=embedding_model, base_url=ollama_endpoint)
+    if embedding_cache_dir:
+        # Content-addressed on (model, chunk text): a rebuild only embeds chunks it has not seen before.
+        # Namespacing by model keeps vectors of different dimensions apart.
+        from langchain.embeddings import CacheBackedEmbeddings
+        from langchain.storage import LocalFileStore
+        embeddings = CacheBackedEmbeddings.from_bytes_store(
+            embeddings, LocalFileStore(embedding_cache_dir), namespace=embedding_model
+        )
+        log_to_sublog(project_dir, "build_rag.log", f"Using embedding cache at {embedding_cache_dir}")
     
     tracking_status = hash_tracker.get_tracking_status()
     tracking_method = tracking_status['tracking_method']
@@ -213,9 +248,7 @@ def build_rag(project_dir, ollama_model, ollama_endpoint, log_placeholder, proje
         log_to_sublog(project_dir, "rag_manager.log", f"Processing file ({file_index + 1}/{len(files_to_process)}): {path}")
         file_chunk_count = 0
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-            chunks = chunker(content)
+            chunks = chunk_file(path, ext, chunker, project_config.project_type)
             for i, chunk_data in enumerate(chunks):
                 if isinstance(chunk_data, str):
                     chunk_data = {"content": chunk_data}
@@ -5,7 +5,7 @@ from langchain.prompts import PromptTemplate
 from build_rag import update_logs, get_impact
 from context_builder import ContextBuilder
 from query_intent_classifier import QueryIntentClassifier
-from logger import log_highlight, log_to_sublog
+from logger import log_highlight, log_to_sublog, new_thinking_logs
 
 class ChatHandler:
     """
@@ -43,7 +43,7 @@ class ChatHandler:
         log_highlight("ChatHandler.process_query")
         
         # Ensure thinking_logs is initialized
-        st.session_state.setdefault("thinking_logs", [])
+        st.session_state.setdefault("thinking_logs", new_thinking_logs())
         
         st.session_state.thinking_logs.append("🧠 Starting enhanced query processing...")
         update_logs(log_placeholder)
@@ -196,6 +196,9 @@ class ChatHandler:
 
     def _rerank_docs_by_intent(self, source_documents, query, intent):
         """Rerank and return actual Document objects (not file name strings)."""
+        # Sources are lower-cased below, so match against lower-cased priority names
+        priority_files = self.project_config.priority_lower_tuple
+
         def score(doc):
             source = doc.metadata.get("source", "").lower()
             content = doc.page_content.lower()
@@ -209,7 +212,7 @@ class ChatHandler:
                     score += 0.5
 
             if intent == "overview":
-                if any(pf in source for pf in self.project_config.get_priority_files()):
+                if any(pf in source for pf in priority_files):
                     score += 5
             elif intent == "business_logic":
                 score += len(meta.get("business_logic_indicators", [])) * 2
@@ -13,8 +13,28 @@ Easily extended—just add new types in the LANGUAGE_CONFIGS dict.
 """
 
 import os
+from functools import cached_property, lru_cache
 from typing import Dict, List, Tuple, Optional
 
+@lru_cache(maxsize=64)
+def _is_network_fs(path: str, network_fs_types: frozenset) -> bool:
+    """Whether path's deepest mount in /proc/mounts has a type in network_fs_types; memoized per path."""
+    try:
+        path = os.path.realpath(path)
+        best_mount, best_type = "", ""
+        with open("/proc/mounts", "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 3:
+                    continue
+                mount_point, fs_type = parts[1], parts[2]
+                if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) \
+                        and len(mount_point) > len(best_mount):
+                    best_mount, best_type = mount_point, fs_type
+        return best_type in network_fs_types
+    except (OSError, ValueError):
+        return False
+
 class ProjectConfig:
     """
     Provides all config info for a project: file extensions, entity patterns, chunking and detection logic.
@@ -258,6 +278,12 @@ class ProjectConfig:
 
     # Default database directory name
     DEFAULT_DB_NAME = "codebase-qa"
+
+    # Filesystem types treated as network mounts (per-directory RPC latency)
+    NETWORK_FS_TYPES = frozenset({
+        "nfs", "nfs4", "cifs", "smbfs", "smb3", "afs", "9p",
+        "fuse.sshfs", "davfs", "glusterfs", "ceph",
+    })
     
     def __init__(self, project_type: str = None, custom_config: Dict = None, project_dir: str = "."):
         self.project_type = project_type or self.auto_detect_project_type(project_dir)
@@ -282,6 +308,19 @@ class ProjectConfig:
     def get_priority_files(self) -> List[str]:
         return self.config.get("priority_files", [])
 
+    # Frozen views of the config lists, built once per instance for hot loops
+    @cached_property
+    def extensions_tuple(self) -> Tuple[str, ...]:
+        return tuple(self.get_extensions())
+
+    @cached_property
+    def priority_files_tuple(self) -> Tuple[str, ...]:
+        return tuple(self.get_priority_files())
+
+    @cached_property
+    def priority_lower_tuple(self) -> Tuple[str, ...]:
+        return tuple(pf.lower() for pf in self.priority_files_tuple)
+
     def get_ignore_patterns(self) -> List[str]:
         return self.config.get("ignore_patterns", [])
 
@@ -339,6 +378,13 @@ class ProjectConfig:
         """Get the absolute path to the git commit tracking file."""
         return os.path.join(self.get_db_dir(), "last_commit.json")
     
+    def is_remote_db(self) -> bool:
+        """Check if the database directory lives on a network filesystem (NFS/SMB/...).
+
+        Resolved from /proc/mounts once per directory; platforms without it are treated as local.
+        """
+        return _is_network_fs(self.get_db_dir(), self.NETWORK_FS_TYPES)
+    
     def create_directories(self):
         """Create all necessary directories."""
         os.makedirs(self.get_db_dir(), exist_ok=True)
@@ -0,0 +1,102 @@
+"""
+Shared os.scandir directory walker for vector DB sizing and project file scans.
+"""
+
+import os
+import threading
+from collections import namedtuple
+
+# File count, total bytes and the names directly under the root, from one walk of a tree
+TreeStats = namedtuple("TreeStats", ["file_count", "total_bytes", "top_names"])
+
+def _scan_dir(path, prune, stat_files):
+    """List one directory as (dirs, files) DirEntry lists; anything that is not a real directory counts as a file."""
+    dirs, files = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                # Symlinks are never followed, so a linked directory can't loop the walk or be counted twice
+                if entry.is_dir(follow_symlinks=False):
+                    if prune is None or not prune(entry):
+                        dirs.append(entry)
+                    continue
+                if stat_files:
+                    try:
+                        entry.stat(follow_symlinks=False)  # cached on the entry for the caller
+                    except OSError:
+                        continue  # removed while walking
+                files.append(entry)
+    except OSError:
+        pass  # unreadable or removed while walking
+    return dirs, files
+
+def _walk_tree_threaded(top, prune, threads, stat_files):
+    """walk_tree with worker threads popping directories from a shared LIFO stack and scanning them concurrently."""
+    paths = [top]
+    output = []
+    pending = [1]  # directories queued or still being scanned
+    cond = threading.Condition()
+
+    def worker():
+        while True:
+            with cond:
+                while not paths and pending[0]:
+                    cond.wait()
+                if not paths:
+                    return
+                path = paths.pop()
+            dirs, files = _scan_dir(path, prune, stat_files)
+            with cond:
+                paths.extend(entry.path for entry in dirs)
+                pending[0] += len(dirs) - 1
+                output.append((path, dirs, files))
+                cond.notify_all()
+
+    workers = [threading.Thread(target=worker, daemon=True) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    while True:
+        with cond:
+            while not output and pending[0]:
+                cond.wait()
+            batch, output[:] = output[:], []
+            done = not pending[0]
+        yield from batch
+        if done:
+            break
+    for t in workers:
+        t.join()
+
+def walk_tree(top, prune=None, threads=1, stat_files=False):
+    """Yield (dirpath, dirs, files) DirEntry lists for top and every directory below it.
+
+    prune(entry) returning True skips that subdirectory. With stat_files each file's lstat result is
+    fetched during the walk and cached on its entry. threads > 1 scans directories concurrently, for
+    high-latency (network) filesystems; directories then come out in no particular order.
+    """
+    if threads > 1:
+        yield from _walk_tree_threaded(top, prune, threads, stat_files)
+        return
+    stack = [top]
+    while stack:
+        path = stack.pop()
+        dirs, files = _scan_dir(path, prune, stat_files)
+        stack.extend(entry.path for entry in dirs)
+        yield path, dirs, files
+
+def iter_files(top, prune=None):
+    """Yield a DirEntry for every file under top."""
+    for _, _, files in walk_tree(top, prune):
+        yield from files
+
+def tree_stats(top, threads=1):
+    """Return TreeStats for top in one walk."""
+    count = size = 0
+    top_names = set()
+    for dirpath, dirs, files in walk_tree(top, threads=threads, stat_files=True):
+        count += len(files)
+        size += sum(entry.stat(follow_symlinks=False).st_size for entry in files)
+        if dirpath == top:
+            top_names.update(entry.name for entry in dirs)
+            top_names.update(entry.name for entry in files)
+    return TreeStats(count, size, top_names)
@@ -22,6 +22,8 @@ class FileHashTracker:
     def get_changed_files(self, extensions):
         """Returns list of changed/new files for processing."""
         log_highlight("FileHashTracker.get_changed_files")
+        # str.endswith takes a tuple directly; build it once instead of once per file
+        extensions = tuple(extensions)
         method = self._detect_tracking_method()
         if method == "git":
             changes = self._get_git_changed_files(extensions)
@@ -58,7 +60,7 @@ class FileHashTracker:
                 # Filter by extensions and respect hierarchical .gitignore
                 result = []
                 for file_path in all_files:
-                    if file_path.endswith(tuple(extensions)):
+                    if file_path.endswith(extensions):
                         abs_path = os.path.join(self.project_dir, file_path)
                         if os.path.isfile(abs_path) and not self._should_ignore_file(abs_path):
                             result.append(abs_path)
@@ -89,7 +91,7 @@ class FileHashTracker:
                 
                 # Convert to absolute paths and filter by extensions
                 for file_path in commit_changed_files:
-                    if file_path.endswith(tuple(extensions)):
+                    if file_path.endswith(extensions):
                         abs_path = os.path.join(self.project_dir, file_path)
                         if os.path.isfile(abs_path) and not self._should_ignore_file(abs_path):
                             changed_files.append(abs_path)
@@ -114,7 +116,7 @@ class FileHashTracker:
                 log_to_sublog(self.project_dir, "file_tracking.log", f"Working directory changes: {working_dir_changed}")
                 
                 for file_path in working_dir_changed:
-                    if file_path.endswith(tuple(extensions)):
+                    if file_path.endswith(extensions):
                         abs_path = os.path.join(self.project_dir, file_path)
                         if os.path.isfile(abs_path) and not self._should_ignore_file(abs_path):
                             if abs_path not in changed_files:  # Avoid duplicates
@@ -161,7 +163,7 @@ class FileHashTracker:
             dirs[:] = [d for d in dirs if not self._should_ignore_file(os.path.join(root, d))]
             
             for fname in files:
-                if fname.endswith(tuple(extensions)):
+                if fname.endswith(extensions):
                     path = os.path.join(root, fname)
                     
                     # Skip files that should be ignored
@@ -4,7 +4,12 @@ import os
 import logging
 import sys
 import inspect
+from collections import deque
 from datetime import datetime
+from itertools import count
+
+# Only the most recent thinking_logs entries are ever displayed, so the session store is bounded
+THINKING_LOGS_MAXLEN = 50
 
 def setup_global_logger(log_dir="logs"):
     """Configure a global logger with file and stdout output, with file rotation per session."""
@@ -106,6 +111,27 @@ def _get_logs_dir(project_dir):
         os.makedirs(temp_dir, exist_ok=True)
         return temp_dir
 
+# Process-wide, so a version is never repeated even when a session's thinking_logs is replaced
+_thinking_log_versions = count(1)
+
+class ThinkingLogs(deque):
+    """Bounded thinking_logs deque stamped with a new version on every append.
+
+    Once the deque is full its length and end entries can repeat, so readers key cached renders on version.
+    """
+
+    def __init__(self, entries=(), maxlen=THINKING_LOGS_MAXLEN):
+        super().__init__(entries, maxlen)
+        self.version = next(_thinking_log_versions)
+
+    def append(self, item):
+        super().append(item)
+        self.version = next(_thinking_log_versions)
+
+def new_thinking_logs(entries=()):
+    """Create the bounded session-state store for thinking_logs."""
+    return ThinkingLogs(entries)
+
 def log_highlight(msg, logger=None):
     frame = inspect.currentframe().f_back
     file = os.path.basename(frame.f_code.co_filename)
@@ -86,16 +86,16 @@ class ProcessManager:
                        help="Disabled during RAG building")
             return previous_state
         else:
-            # Allow normal debug mode control - let Streamlit manage the state
-            debug_mode = st.checkbox("🐞 Enable Debug Mode", value=st.session_state.get("debug_mode", False), 
-                             key="debug_mode", help="Show debugging tools and detailed logs")
-            
-            # Log debug mode changes
-            project_dir = st.session_state.get("project_dir", "unknown")
-            if debug_mode != st.session_state.get("debug_mode", False):
-                log_to_sublog(project_dir, "process_manager.log", f"🔧 Debug mode changed to: {debug_mode}")
-            
-            return debug_mode
+            # The widget key is the single source of truth; changes are logged from its callback
+            return st.checkbox("🐞 Enable Debug Mode", key="debug_mode",
+                               on_change=ProcessManager._log_debug_mode_change,
+                               help="Show debugging tools and detailed logs")
+    
+    @staticmethod
+    def _log_debug_mode_change():
+        """Log debug mode toggles (on_change callback of the debug mode checkbox)."""
+        project_dir = st.session_state.get("project_dir", "unknown")
+        log_to_sublog(project_dir, "process_manager.log", f"🔧 Debug mode changed to: {st.session_state.debug_mode}")
     
     @staticmethod
     def safe_force_rebuild_check():
@@ -5,7 +5,7 @@ from langchain_ollama import ChatOllama
 from langchain.chains import RetrievalQA
 from config import ProjectConfig
 from model_config import model_config
-from logger import log_highlight, log_to_sublog
+from logger import log_highlight, log_to_sublog, new_thinking_logs
 from build_rag import build_rag
 from chat_handler import ChatHandler
 
@@ -24,7 +24,7 @@ class RagManager:
         """Initialize Streamlit session state variables."""
         st.session_state.setdefault("retriever", None)
         st.session_state.setdefault("project_dir_used", None)
-        st.session_state.setdefault("thinking_logs", [])
+        st.session_state.setdefault("thinking_logs", new_thinking_logs())
         st.session_state.setdefault("qa_chain", None)
         st.session_state.setdefault("chat_history", [])
     
@@ -142,7 +142,7 @@ class RagManager:
         
         # Check if there are any changed files
         tracker = FileHashTracker(project_dir, db_dir)
-        extensions = project_config.get_extensions()
+        extensions = project_config.extensions_tuple
         changed_files = tracker.get_changed_files(extensions)
         
         if changed_files:
@@ -152,8 +152,8 @@ class RagManager:
             log_to_sublog(project_dir, "rag_manager.log", "No changed files detected, skipping rebuild")
             return {"rebuild": False, "reason": "no_changes", "files": []}
     
-    def build_rag_index(self, project_dir, ollama_model, ollama_endpoint, project_type, log_placeholder, incremental=False, files_to_process=None):
-        """Build the RAG index and setup QA chain."""
+    def build_rag_index(self, project_dir, ollama_model, ollama_endpoint, project_type, log_placeholder, incremental=False, files_to_process=None, embedding_cache_dir=None):
+        """Build the RAG index and setup QA chain; embedding_cache_dir enables the on-disk chunk embedding cache."""
         log_highlight("RagManager.build_rag_index")
         
         with st.spinner("🔄 Building RAG index..."):
@@ -166,7 +166,8 @@ class RagManager:
                     log_placeholder=log_placeholder,
                     project_type=project_type,
                     incremental=True,
-                    files_to_process=files_to_process
+                    files_to_process=files_to_process,
+                    embedding_cache_dir=embedding_cache_dir
                 )
             else:
                 log_to_sublog(project_dir, "rag_manager.log", "Full rebuild: processing all files")
@@ -175,7 +176,8 @@ class RagManager:
                     ollama_model=ollama_model,
                     ollama_endpoint=ollama_endpoint,
                     log_placeholder=log_placeholder,
-                    project_type=project_type
+                    project_type=project_type,
+                    embedding_cache_dir=embedding_cache_dir
                 )
             
             st.session_state["retriever"] = retriever
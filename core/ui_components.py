@@ -2,104 +2,333 @@
 
 import streamlit as st
 import os
-import shutil
+import gc
+import hashlib
+import io
+from contextlib import contextmanager
+from functools import lru_cache
 from config import ProjectConfig
+from fs_walk import tree_stats
 from model_config import model_config
-from logger import log_highlight, log_to_sublog
+from logger import ThinkingLogs, get_project_log_file, log_highlight, new_thinking_logs
 from process_manager import ProcessManager
 
+# Status icon indexed by a boolean check result: _STATUS_ICON[exists]
+_STATUS_ICON = ("❌", "✅")
+
+# Queries run by the Retrieval Tester's "Test Multiple Queries" button
+_SAMPLE_QUERIES = (
+    "How does the MainActivity work?",
+    "What are the main UI components?",
+    "How is data passed between activities?",
+    "What are the key configuration files?",
+)
+
+# Debug tabs rerun as fragments so a widget in one tab doesn't rerun the whole app.
+# Partial reruns of the debug tabs only happen on Streamlit >= 1.37 (st.fragment) or 1.33-1.36
+# (st.experimental_fragment). The supported minimum is 1.28, and before 1.33 the decorator is a no-op, so every
+# widget interaction in those tabs reruns the whole script as it did before fragments were used.
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+# Static page styling emitted by render_custom_css
+_CSS = """
+<style>
+.stExpander > div:first-child {
+    background-color: #f0f2f6;
+}
+.stExpander > div:first-child:hover {
+    background-color: #e6e9ef;
+}
+
+/* Custom styling for log text areas */
+.stTextArea textarea {
+    font-family: 'Courier New', monospace !important;
+    font-size: 12px !important;
+    line-height: 1.4 !important;
+}
+
+/* Ensure text areas scroll to bottom (for newer logs) */
+.stTextArea textarea:focus {
+    scroll-behavior: smooth;
+}
+</style>
+"""
+
+# Sidebar log lines are kept per session and written in one batch per log file when the sidebar finishes rendering
+_LOG_BUFFER_KEY = "_sidebar_log_buffer"
+
+def _queue_log(project_dir, subname, msg):
+    """Buffer a log_to_sublog call in this session until the next _flush_logs()."""
+    # Resolve the file now so the line lands where log_to_sublog would have put it, even if the
+    # project type changes before the flush
+    st.session_state.setdefault(_LOG_BUFFER_KEY, []).append((get_project_log_file(project_dir, subname), msg))
+
+def _flush_logs():
+    """Write this session's buffered log lines with one open/write per log file."""
+    buffered = st.session_state.pop(_LOG_BUFFER_KEY, None)
+    if not buffered:
+        return
+    groups = {}
+    for logfile, msg in buffered:
+        groups.setdefault(logfile, []).append(msg.rstrip() + "\n")
+    for logfile, lines in groups.items():
+        os.makedirs(os.path.dirname(logfile), exist_ok=True)
+        with open(logfile, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+
+@contextmanager
+def _buffered_logs():
+    """Flush queued log lines on exit, including when st.rerun() unwinds the block."""
+    try:
+        yield
+    finally:
+        _flush_logs()
+
+def _debug_enabled():
+    """Whether the 5-click debug mode is on, restoring it from the ?debug=1 URL query param after a reload."""
+    ss = st.session_state
+    if not ss.get("debug_mode_enabled"):
+        # st.query_params needs Streamlit >= 1.30
+        query_params = getattr(st, "query_params", None)
+        ss.debug_mode_enabled = query_params is not None and query_params.get("debug") == "1"
+    return ss.debug_mode_enabled
+
+@lru_cache(maxsize=16)
+def _abspath(path):
+    """os.path.abspath memoized for the handful of project paths resolved on every rerun."""
+    return os.path.abspath(path)
+
+@contextmanager
+def _gc_paused():
+    """Suspend automatic garbage collection while a render burst allocates many short-lived objects."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+            gc.collect(generation=0)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _build_stats(db_dir, mtime_ns, remote):
+    """Collect build-status metrics for db_dir; cached per (db_dir, mtime_ns) for 30s across reruns."""
+    # Network filesystems are walked with many threads to hide per-directory latency
+    total_files, size, top_names = tree_stats(db_dir, threads=32 if remote else 1)
+    # Marker files are looked up in the root listing gathered by the walk, not with extra stat calls
+    return {
+        "total_files": total_files,
+        "size": size,
+        "chroma": "chroma.sqlite3" in top_names,
+        "git_tracking": "git_tracking.json" in top_names,
+        "last_commit": "last_commit.json" in top_names,
+    }
+
+# Files whose (mtime_ns, size) identify the contents of a built index
+_INDEX_SIG_FILES = ("chroma.sqlite3", "git_tracking.json", "hierarchical_index.json")
+
+def _retrieval_cache_sig(vector_db_dir, embedding_model=None):
+    """Content signature of the current index: changes when any index file is rewritten.
+
+    Nothing session-specific goes into it, so every session inspecting the same index shares cache entries.
+    """
+    h = hashlib.blake2b(f"{vector_db_dir}\0{embedding_model}".encode(), digest_size=16)
+    for name in _INDEX_SIG_FILES:
+        try:
+            stat = os.stat(os.path.join(vector_db_dir, name))
+        except OSError:
+            continue
+        h.update(f"\0{name}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+    return h.hexdigest()
+
+@st.cache_data(show_spinner=False)
+def _cached_chunks(_debug_tools, file_path, file_mtime, db_sig):
+    """Memoized DebugTools.analyze_file_chunks per (file, file mtime, index signature)."""
+    return _debug_tools.analyze_file_chunks(file_path)
+
+@st.cache_data(show_spinner=False)
+def _cached_multiple_queries(_debug_tools, queries, db_sig):
+    """Memoized DebugTools.test_multiple_queries per (queries, index signature)."""
+    return _debug_tools.test_multiple_queries(list(queries))
+
+@st.cache_resource(show_spinner=False)
+def _get_project_config(project_dir, project_type=None):
+    """Shared ProjectConfig per (project_dir, project_type), built once instead of on every rerun."""
+    return ProjectConfig(project_dir=project_dir, project_type=project_type)
+
+def clear_project_config_cache():
+    """Drop cached ProjectConfig instances (e.g. after a project type switch or backup)."""
+    _get_project_config.clear()
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _check_existing_data(project_dir):
+    """Cached ProjectConfig.check_existing_data for the sidebar's directory-change warning."""
+    return bool(_get_project_config(project_dir).check_existing_data())
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _db_exists(project_dir, project_type):
+    """Cached ProjectConfig.get_project_type_db_exists per (project_dir, project_type)."""
+    return _get_project_config(project_dir, project_type).get_project_type_db_exists()
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _all_project_type_dbs(project_dir, project_type):
+    """Cached ProjectConfig.get_all_project_type_dbs for the project type dialog."""
+    return _get_project_config(project_dir, project_type).get_all_project_type_dbs()
+
+_debug_tools_path_added = False
+
+def _add_debug_tools_path():
+    """Append the debug_tools directory to sys.path once per process."""
+    global _debug_tools_path_added
+    if _debug_tools_path_added:
+        return
+    import sys
+    debug_tools_path = os.path.join(os.path.dirname(__file__), '..', 'debug_tools')
+    if debug_tools_path not in sys.path:
+        sys.path.append(debug_tools_path)
+    _debug_tools_path_added = True
+
+@st.cache_resource(show_spinner=False)
+def _get_debug_tools(_project_config, db_dir, ollama_model, ollama_endpoint, project_dir, embedding_model):
+    """Import debug_tools and build one DebugTools per (db, model, endpoint, project) instead of every rerun.
+
+    embedding_model is only part of the cache key: DebugTools reads it from model_config at construction.
+    """
+    _add_debug_tools_path()
+    
+    # Import directly from the debug_tools.py file to avoid relative import issues
+    import debug_tools
+    return debug_tools.DebugTools(project_config=_project_config, ollama_model=ollama_model,
+                                  ollama_endpoint=ollama_endpoint, project_dir=project_dir)
+
+def _clear_db_status_cache():
+    """Invalidate cached database existence checks after deleting or backing up a database."""
+    _check_existing_data.clear()
+    _db_exists.clear()
+    _all_project_type_dbs.clear()
+
+@st.cache_data(ttl=3, show_spinner=False)
+def _list_logs(logs_dir):
+    """Return [(name, path)] of .log files in logs_dir, newest first (one scandir pass, cached 3s)."""
+    with os.scandir(logs_dir) as it:
+        entries = [e for e in it if e.name.endswith('.log') and e.is_file(follow_symlinks=False)]
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    return [(e.name, e.path) for e in entries]
+
+def _tail(path, n_bytes=256 * 1024, size=None):
+    """Read the last n_bytes of a file, dropping the first (possibly partial) line when truncated."""
+    if size is None:
+        size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        f.seek(max(0, size - n_bytes), os.SEEK_SET)
+        data = f.read(n_bytes)
+    if size > n_bytes:
+        data = data.split(b'\n', 1)[-1]
+    return data.decode('utf-8', 'replace')
+
+@st.cache_data(ttl=2, max_entries=8, show_spinner=False)
+def _read_log_tail(path, mtime_ns, size, window):
+    """Cached _tail; mtime_ns and size make appends invalidate the entry."""
+    return _tail(path, window, size) if size else ""
+
 class UIComponents:
     """Handles all UI rendering components for the RAG app, restored from the original version."""
 
     def render_sidebar_config(self):
         """Render the sidebar configuration, including the detailed project type selection flow."""
-        with st.sidebar:
+        with st.sidebar, _buffered_logs():
             st.header("🔧 Configuration")
             
             # Check if UI should be disabled during RAG building
             if ProcessManager.disable_ui_during_build():
                 # Return safe state during build
                 safe_state = ProcessManager.get_safe_ui_state()
-                log_to_sublog(safe_state["project_dir"], "ui_components.log", "🔄 UI disabled during RAG build")
+                _queue_log(safe_state["project_dir"], "ui_components.log", "🔄 UI disabled during RAG build")
                 return (safe_state["project_dir"], 
                        safe_state["ollama_model"], 
                        safe_state["ollama_endpoint"], 
                        False,  # No force rebuild during build
                        ProcessManager.safe_debug_mode_check())
             
-            # Get current project directory
-            current_project_dir = st.session_state.get("project_dir", "../")
-            project_dir = st.text_input("📁 Project Directory", value=current_project_dir)
-            
-            # Log project directory changes
-            if project_dir and project_dir != current_project_dir:
-                log_to_sublog(project_dir, "ui_components.log", f"📁 Project directory changed: {current_project_dir} -> {project_dir}")
+            # Snapshot the session-state keys this function reads so each is looked up once
+            ss = st.session_state
+            current_project_dir = ss.get("project_dir", "../")
+            current_model = ss["ollama_model"] if "ollama_model" in ss else model_config.get_ollama_model()
+            current_endpoint = ss["ollama_endpoint"] if "ollama_endpoint" in ss else model_config.get_ollama_endpoint()
+            debug_mode_enabled = _debug_enabled()
+            project_dir = st.text_input("📁 Project Directory", value=current_project_dir, key="w_project_dir")
             
             # Check if project directory has changed
             if project_dir and project_dir != current_project_dir:
-                project_dir = os.path.abspath(project_dir)
+                # Log against the current directory; the new directory's log path is only
+                # resolved (and created) once the change is committed
+                _queue_log(current_project_dir, "ui_components.log", f"📁 Project directory changed: {current_project_dir} -> {project_dir}")
+                project_dir = _abspath(project_dir)
                 
                 # Check for existing data and warn user
-                project_config = ProjectConfig(project_dir=project_dir)
+                project_config = _get_project_config(project_dir)
                 
-                if project_config.check_existing_data():
+                if _check_existing_data(project_dir):
                     st.warning("⚠️ **Warning:** Changing the project directory will result in loss of existing database, logs, and configuration. All current RAG data will be lost!")
                     
                     col1, col2 = st.columns(2)
-                    if col1.button("✅ Confirm Change"):
-                        log_to_sublog(project_dir, "ui_components.log", "✅ User confirmed project directory change")
+                    if col1.button("✅ Confirm Change", key="w_confirm_dir_change"):
+                        _queue_log(project_dir, "ui_components.log", "✅ User confirmed project directory change")
                         # Clear existing data
                         import shutil
                         if os.path.exists(project_config.get_db_dir()):
                             shutil.rmtree(project_config.get_db_dir())
-                            log_to_sublog(project_dir, "ui_components.log", f"🗑️ Deleted existing database: {project_config.get_db_dir()}")
+                            _clear_db_status_cache()
+                            _queue_log(project_dir, "ui_components.log", f"🗑️ Deleted existing database: {project_config.get_db_dir()}")
                         st.success("🗑️ Cleared existing data. New directory will be used.")
-                        st.session_state["project_dir"] = project_dir
+                        ss["project_dir"] = project_dir
                         st.rerun()
-                    if col2.button("❌ Cancel"):
-                        log_to_sublog(project_dir, "ui_components.log", "❌ User cancelled project directory change")
+                    if col2.button("❌ Cancel", key="w_cancel_dir_change"):
+                        _queue_log(current_project_dir, "ui_components.log", "❌ User cancelled project directory change")
                         st.rerun()
                 else:
-                    st.session_state["project_dir"] = project_dir
-                    log_to_sublog(project_dir, "ui_components.log", f"📁 Project directory updated: {project_dir}")
+                    ss["project_dir"] = project_dir
+                    _queue_log(project_dir, "ui_components.log", f"📁 Project directory updated: {project_dir}")
             
             # Resolve the absolute path to ensure vector_db is created in the source project directory
             if project_dir:
-                project_dir = os.path.abspath(project_dir)
-                st.session_state["project_dir"] = project_dir
+                project_dir = _abspath(project_dir)
+                if project_dir != current_project_dir:
+                    ss["project_dir"] = project_dir
 
             project_types = list(ProjectConfig.LANGUAGE_CONFIGS.keys())
-            if "selected_project_type" not in st.session_state:
-                st.session_state.selected_project_type = None
+            ss.setdefault("selected_project_type", None)
 
             # Only allow project type changes if not building
             if ProcessManager.safe_project_type_change():
                 self._render_project_type_selector(project_types)
             
-            ollama_model = st.text_input("🧠 Ollama Model", value=st.session_state.get("ollama_model", model_config.get_ollama_model()))
-            ollama_endpoint = st.text_input("🔗 Ollama Endpoint", value=st.session_state.get("ollama_endpoint", model_config.get_ollama_endpoint()))
+            # Model settings live in a form so edits only rerun the app once, when applied
+            with st.form("ollama_cfg", clear_on_submit=False):
+                model_input = st.text_input("🧠 Ollama Model", value=current_model, key="w_ollama_model")
+                endpoint_input = st.text_input("🔗 Ollama Endpoint", value=current_endpoint, key="w_ollama_endpoint")
+                applied = st.form_submit_button("✅ Apply")
             
-            # Log configuration changes
-            current_model = st.session_state.get("ollama_model", model_config.get_ollama_model())
-            current_endpoint = st.session_state.get("ollama_endpoint", model_config.get_ollama_endpoint())
+            ollama_model, ollama_endpoint = current_model, current_endpoint
             
-            if ollama_model != current_model:
-                log_to_sublog(project_dir, "ui_components.log", f"🧠 Ollama model changed: {current_model} -> {ollama_model}")
-                st.session_state["ollama_model"] = ollama_model
+            # Log configuration changes
+            if applied and model_input != current_model:
+                _queue_log(project_dir, "ui_components.log", f"🧠 Ollama model changed: {current_model} -> {model_input}")
+                ss["ollama_model"] = ollama_model = model_input
             
-            if ollama_endpoint != current_endpoint:
-                log_to_sublog(project_dir, "ui_components.log", f"🔗 Ollama endpoint changed: {current_endpoint} -> {ollama_endpoint}")
-                st.session_state["ollama_endpoint"] = ollama_endpoint
+            if applied and endpoint_input != current_endpoint:
+                _queue_log(project_dir, "ui_components.log", f"🔗 Ollama endpoint changed: {current_endpoint} -> {endpoint_input}")
+                ss["ollama_endpoint"] = ollama_endpoint = endpoint_input
 
             # Use safe force rebuild check
             force_rebuild = ProcessManager.safe_force_rebuild_check()
-            if st.session_state.selected_project_type is None and not ProcessManager.is_building_rag():
+            if ss.selected_project_type is None and not ProcessManager.is_building_rag():
                 st.info("👆 Select a project type to enable the index rebuild.")
 
             st.divider()
             # Only show debug mode if enabled via 5-click method
             debug_mode = False
-            if st.session_state.get("debug_mode_enabled", False):
+            if debug_mode_enabled:
                 debug_mode = ProcessManager.safe_debug_mode_check()
             # Don't set session state here as the widget already manages it
 
@@ -130,7 +359,8 @@ class UIComponents:
             st.warning("⚠️ Please select your project type to begin")
             selected_type = st.selectbox(
                 "🎯 Select Project Type", [""] + project_types, index=0,
-                help="Choose the primary programming language/framework of your project"
+                help="Choose the primary programming language/framework of your project",
+                key="w_project_type"
             )
             if selected_type:
                 st.session_state.selected_project_type = selected_type
@@ -144,44 +374,46 @@ class UIComponents:
         project_dir = st.session_state.get("project_dir", "../")
         
         # Check if current project type has existing database
-        current_config = ProjectConfig(project_dir=os.path.abspath(project_dir), project_type=current_type)
-        has_current_db = current_config.get_project_type_db_exists()
+        abs_project_dir = _abspath(project_dir)
+        has_current_db = _db_exists(abs_project_dir, current_type)
         
         if has_current_db:
             st.success(f"📌 Project type: **{current_type}** (Database exists)")
         else:
             st.info(f"📌 Project type: **{current_type}** (No database - rebuild needed)")
             
-        if st.button("🔄 Change Project Type"):
+        if st.button("🔄 Change Project Type", key="w_change_project_type"):
             st.session_state.show_project_change_dialog = True
 
-        if st.session_state.get("show_project_change_dialog"):
-            # Check for existing databases
-            all_dbs = current_config.get_all_project_type_dbs()
-            
-            if all_dbs:
-                st.warning("⚠️ **Existing databases detected:**")
-                for db in all_dbs:
-                    st.write(f"  • {db}")
-                st.info("💾 **Existing data will be backed up before switching project types**")
-            
-            new_type = st.selectbox("🎯 New Project Type", project_types, index=project_types.index(current_type))
-            
-            # Check if new project type has existing database
-            new_config = ProjectConfig(project_dir=os.path.abspath(project_dir), project_type=new_type)
-            has_new_db = new_config.get_project_type_db_exists()
-            
-            if has_new_db:
-                st.success(f"✅ **{new_type}** database already exists - no rebuild needed")
-            else:
-                st.info(f"🔄 **{new_type}** database will be created on first query")
-            
-            col1, col2 = st.columns(2)
-            if col1.button("✅ Confirm Change"):
-                self._handle_project_type_change(new_type)
-            if col2.button("❌ Cancel"):
-                st.session_state.show_project_change_dialog = False
-                st.rerun()
+        # Nothing below is needed unless the dialog is open
+        if not st.session_state.get("show_project_change_dialog"):
+            return
+
+        # Check for existing databases
+        all_dbs = _all_project_type_dbs(abs_project_dir, current_type)
+        
+        if all_dbs:
+            st.warning("⚠️ **Existing databases detected:**")
+            st.markdown("\n".join(f"- {db}" for db in all_dbs))
+            st.info("💾 **Existing data will be backed up before switching project types**")
+        
+        new_type = st.selectbox("🎯 New Project Type", project_types, index=project_types.index(current_type),
+                                key="w_new_project_type")
+        
+        # Check if new project type has existing database
+        has_new_db = _db_exists(abs_project_dir, new_type)
+        
+        if has_new_db:
+            st.success(f"✅ **{new_type}** database already exists - no rebuild needed")
+        else:
+            st.info(f"🔄 **{new_type}** database will be created on first query")
+        
+        col1, col2 = st.columns(2)
+        if col1.button("✅ Confirm Change", key="w_confirm_type_change"):
+            self._handle_project_type_change(new_type)
+        if col2.button("❌ Cancel", key="w_cancel_type_change"):
+            st.session_state.show_project_change_dialog = False
+            st.rerun()
 
     def _handle_project_type_change(self, new_type):
         """Handle project type change, including backing up existing data."""
@@ -190,7 +422,7 @@ class UIComponents:
         
         if project_dir:
             current_type = st.session_state.selected_project_type
-            current_config = ProjectConfig(project_dir=os.path.abspath(project_dir), project_type=current_type)
+            current_config = _get_project_config(_abspath(project_dir), current_type)
             
             # Backup existing database if it exists
             if current_config.get_project_type_db_exists():
@@ -198,12 +430,14 @@ class UIComponents:
                     backup_path = current_config.backup_existing_db(current_type)
                     if backup_path:
                         st.success(f"💾 Backed up existing {current_type} database to: {os.path.basename(backup_path)}")
-                        log_to_sublog(current_config.get_logs_dir(), "ui_components.log", 
-                                     f"Backed up {current_type} database to: {backup_path}")
+                        _queue_log(current_config.get_logs_dir(), "ui_components.log", 
+                                  f"Backed up {current_type} database to: {backup_path}")
                 except Exception as e:
                     st.error(f"❌ Error backing up database: {e}")
-                    log_to_sublog(current_config.get_logs_dir(), "ui_components.log", 
-                                 f"Error backing up database: {e}")
+                    _queue_log(current_config.get_logs_dir(), "ui_components.log", 
+                              f"Error backing up database: {e}")
+                clear_project_config_cache()
+                _clear_db_status_cache()
             
             # Clear session state for new project type
             st.session_state.selected_project_type = new_type
@@ -214,35 +448,38 @@ class UIComponents:
             st.session_state.show_project_change_dialog = False
             
             # Check if new project type has existing database
-            new_config = ProjectConfig(project_dir=os.path.abspath(project_dir), project_type=new_type)
+            new_config = _get_project_config(_abspath(project_dir), new_type)
             if new_config.get_project_type_db_exists():
                 st.success(f"✅ Changed to {new_type}. Database already exists - ready to use!")
             else:
                 st.info(f"✅ Changed to {new_type}. Database will be created on first query.")
             
-            log_to_sublog(current_config.get_logs_dir(), "ui_components.log", f"Project type changed to: {new_type}")
+            _queue_log(current_config.get_logs_dir(), "ui_components.log", f"Project type changed to: {new_type}")
             st.rerun()
 
     def render_welcome_screen(self):
         """Render the welcome screen with 5-click debug mode."""
         # 5-click debug mode logic
-        if "debug_clicks" not in st.session_state:
-            st.session_state.debug_clicks = 0
-        if "debug_mode_enabled" not in st.session_state:
-            st.session_state.debug_mode_enabled = False
-        
+        ss = st.session_state
+        debug_clicks = ss.setdefault("debug_clicks", 0)
+        debug_mode_enabled = _debug_enabled()
+
         # Create a clickable title that tracks clicks
         if st.button("🤖 Codebase QA", key="title_button", help="Click 5 times to enable debug mode"):
-            st.session_state.debug_clicks += 1
-            if st.session_state.debug_clicks >= 5:
-                st.session_state.debug_mode_enabled = True
-                st.session_state.debug_clicks = 0
+            debug_clicks += 1
+            if debug_clicks >= 5:
+                ss.debug_mode_enabled = True
+                # Persist in the URL so a reload keeps debug mode on
+                if hasattr(st, "query_params"):
+                    st.query_params["debug"] = "1"
+                ss.debug_clicks = 0
                 st.success("🔧 Debug mode enabled! Check the sidebar for debug options.")
                 st.rerun()
+            ss.debug_clicks = debug_clicks
         
         # Show click count in debug mode
-        if st.session_state.debug_mode_enabled:
-            st.caption(f"Debug clicks: {st.session_state.debug_clicks}/5")
+        if debug_mode_enabled:
+            st.caption(f"Debug clicks: {debug_clicks}/5")
         
         st.info("🎯 **Welcome!** Please select your project type in the sidebar to get started.")
         st.markdown("""
@@ -259,28 +496,9 @@ class UIComponents:
 
     def render_custom_css(self):
         """Render custom CSS for styling."""
-        st.markdown("""
-        <style>
-        .stExpander > div:first-child {
-            background-color: #f0f2f6;
-        }
-        .stExpander > div:first-child:hover {
-            background-color: #e6e9ef;
-        }
-        
-        /* Custom styling for log text areas */
-        .stTextArea textarea {
-            font-family: 'Courier New', monospace !important;
-            font-size: 12px !important;
-            line-height: 1.4 !important;
-        }
-        
-        /* Ensure text areas scroll to bottom (for newer logs) */
-        .stTextArea textarea:focus {
-            scroll-behavior: smooth;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        # Streamlit drops elements that aren't re-emitted on a rerun, so the CSS can't be injected only once;
+        # the string itself is a module constant so nothing is rebuilt per call
+        st.markdown(_CSS, unsafe_allow_html=True)
 
     def render_chat_input(self):
         """Render chat input form, restored from the original version."""
@@ -296,35 +514,78 @@ class UIComponents:
 
     def render_chat_history(self):
         """Render chat history with expanders and detailed metadata, restored from the original."""
-        if st.session_state.get("chat_history"):
-            for i, chat_item in enumerate(reversed(st.session_state.chat_history)):
-                # Handle both old (4 items) and new (5 items) formats for backward compatibility
-                q, a, srcs, impact_files, metadata = (*chat_item, None)[:5]
-
-                expander_title = f"Q: {q}"
-                if metadata and metadata.get('intent'):
-                    expander_title += f" [{metadata['intent'].replace('_', ' ').title()}]"
-
-                with st.expander(expander_title, expanded=(i == 0)):
-                    st.markdown(f"**A:** {a}")
-                    if metadata:
-                        col1, col2 = st.columns(2)
-                        if metadata.get('intent'): col1.caption(f"🎯 **Intent:** {metadata['intent'].title()}")
-                        if metadata.get('confidence'): col1.caption(f"📊 **Confidence:** {metadata['confidence']:.1%}")
-                        if metadata.get('rewritten_query') and metadata['rewritten_query'] != q:
-                            col2.caption(f"🔄 **Enhanced Query:** {metadata['rewritten_query']}")
-                    if impact_files: st.markdown(f"**🔍 Impacted files:** {', '.join(impact_files)}")
-                    if srcs:
-                        st.markdown("**🔎 Top Sources:**")
-                        for doc in srcs[:5]:
-                            if hasattr(doc, "metadata") and isinstance(doc.metadata, dict):
-                                md = doc.metadata
-                                source_line = f"- `{md.get('source', 'Unknown')}` (chunk {md.get('chunk_index', 0)})"
-                                if md.get('name'): source_line += f" *({md.get('name')})*"
-                                st.markdown(source_line)
+        # Read session state once; the loop below only touches locals
+        chat_history = st.session_state.get("chat_history")
+        if not chat_history:
+            st.session_state.pop("_chat_render_cache", None)
+        else:
+            # Rendered strings per chat item, keyed by id(); the item is stored alongside so a
+            # recycled id can never match, and entries for items no longer in history are dropped
+            render_cache = st.session_state.setdefault("_chat_render_cache", {})
+            if len(render_cache) > len(chat_history):
+                live_ids = {id(item) for item in chat_history}
+                for stale_id in [k for k in render_cache if k not in live_ids]:
+                    del render_cache[stale_id]
+            
+            with _gc_paused():
+                last = len(chat_history) - 1
+                for i in range(last + 1):
+                    chat_item = chat_history[last - i]
+                    cached = render_cache.get(id(chat_item))
+                    if cached is None or cached[0] is not chat_item:
+                        cached = render_cache[id(chat_item)] = (chat_item, self._render_chat_item(chat_item))
+                    expander_title, answer_md, left_captions, right_caption, details_md = cached[1]
+                    
+                    with st.expander(expander_title, expanded=(i == 0)):
+                        st.markdown(answer_md)
+                        if left_captions or right_caption:
+                            col1, col2 = st.columns(2)
+                            for caption in left_captions: col1.caption(caption)
+                            if right_caption: col2.caption(right_caption)
+                        if details_md: st.markdown(details_md)
+
+    @staticmethod
+    def _render_chat_item(chat_item):
+        """Build the strings shown for one chat item: (title, answer, left captions, right caption, details)."""
+        # Handle both old (4 items) and new (5 items) formats for backward compatibility
+        if len(chat_item) == 5:
+            q, a, srcs, impact_files, metadata = chat_item
+        else:
+            (q, a, srcs, impact_files), metadata = chat_item, None
+        intent = metadata.get('intent') if metadata else None
+        
+        expander_title = f"Q: {q}"
+        if intent:
+            expander_title += f" [{intent.replace('_', ' ').title()}]"
+        
+        left_captions, right_caption = [], None
+        if metadata:
+            confidence = metadata.get('confidence')
+            rewritten_query = metadata.get('rewritten_query')
+            if intent: left_captions.append(f"🎯 **Intent:** {intent.title()}")
+            if confidence: left_captions.append(f"📊 **Confidence:** {confidence:.1%}")
+            if rewritten_query and rewritten_query != q:
+                right_caption = f"🔄 **Enhanced Query:** {rewritten_query}"
+        
+        details = io.StringIO()
+        if impact_files: details.write(f"**🔍 Impacted files:** {', '.join(impact_files)}\n\n")
+        if srcs:
+            # One markdown element for the header and all source lines
+            details.write("**🔎 Top Sources:**")
+            for doc in srcs[:5]:
+                if hasattr(doc, "metadata") and isinstance(doc.metadata, dict):
+                    md = doc.metadata
+                    details.write(f"\n- `{md.get('source', 'Unknown')}` (chunk {md.get('chunk_index', 0)})")
+                    if md.get('name'): details.write(f" *({md.get('name')})*")
+        
+        return expander_title, f"**A:** {a}", tuple(left_captions), right_caption, details.getvalue()
 
     def render_debug_section(self, project_config, ollama_model, ollama_endpoint, project_dir):
         """Render comprehensive debug tools and inspection section."""
+        # All five tabs execute on every rerun, so skip the whole scan pipeline unless debug mode is on
+        if not st.session_state.get("debug_mode", False):
+            return
+        
         with st.expander("🔧 Debug & Inspection Tools", expanded=True):
             # Create tabs for different debug tools
             tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -336,17 +597,9 @@ class UIComponents:
             ])
             
             try:
-                import sys
-                import os
-                # Add debug_tools directory to path
-                debug_tools_path = os.path.join(os.path.dirname(__file__), '..', 'debug_tools')
-                if debug_tools_path not in sys.path:
-                    sys.path.append(debug_tools_path)
-                
-                # Import directly from the debug_tools.py file to avoid relative import issues
-                import debug_tools
-                debug_tools_instance = debug_tools.DebugTools(project_config=project_config, ollama_model=ollama_model, 
-                                         ollama_endpoint=ollama_endpoint, project_dir=project_dir)
+                debug_tools_instance = _get_debug_tools(project_config, project_config.get_db_dir(),
+                                                        ollama_model, ollama_endpoint, project_dir,
+                                                        model_config.get_embedding_model())
                 
                 with tab1:
                     self._render_vector_db_inspector(debug_tools_instance)
@@ -370,6 +623,7 @@ class UIComponents:
                 st.error(f"❌ Error loading debug tools: {e}")
                 st.exception(e)
     
+    @_fragment
     def _render_vector_db_inspector(self, debug_tools):
         """Render vector database inspection tools."""
         st.header("📊 Vector Database Inspector")
@@ -385,13 +639,13 @@ class UIComponents:
                         
                         # Display statistics
                         st.subheader("📈 Database Statistics")
-                        col_a, col_b, col_c = st.columns(3)
-                        with col_a:
-                            st.metric("Total Documents", stats.get("total_documents", 0))
-                        with col_b:
-                            st.metric("Unique Files", stats.get("unique_files", 0))
-                        with col_c:
-                            st.metric("Average Chunk Size", f"{stats.get('avg_chunk_size', 0):.0f} chars")
+                        metrics = [
+                            ("Total Documents", stats.get("total_documents", 0)),
+                            ("Unique Files", stats.get("unique_files", 0)),
+                            ("Average Chunk Size", f"{stats.get('avg_chunk_size', 0):.0f} chars"),
+                        ]
+                        for col, (label, value) in zip(st.columns(len(metrics)), metrics):
+                            col.metric(label, value)
                         
                         # Display file breakdown
                         if "file_breakdown" in stats:
@@ -413,6 +667,7 @@ class UIComponents:
                         except Exception as e:
                             st.error(f"❌ Error clearing vector DB: {e}")
     
+    @_fragment
     def _render_chunk_analyzer(self, debug_tools):
         """Render chunk analysis tools."""
         st.header("🔍 Chunk Analyzer")
@@ -422,24 +677,43 @@ class UIComponents:
         if files:
             selected_file = st.selectbox("Select file to analyze:", files)
             
+            # Analysis results persist in session state so paging doesn't re-run the analysis
+            chunks_key = f"chunks::{selected_file}"
             if selected_file and st.button("🔍 Analyze Chunks", type="primary"):
                 with st.spinner("Analyzing chunks..."):
                     try:
-                        chunks = debug_tools.analyze_file_chunks(selected_file)
-                        
-                        st.subheader(f"📄 Chunks for: {selected_file}")
-                        st.write(f"Found {len(chunks)} chunks")
-                        
-                        # Display chunks
-                        for i, chunk in enumerate(chunks):
-                            with st.expander(f"Chunk {i+1} (Metadata: {chunk.get('metadata', {})})"):
-                                st.code(chunk.get('content', ''), language='text')
-                                
+                        abs_file = os.path.join(debug_tools.project_dir, selected_file)
+                        file_mtime = os.path.getmtime(abs_file) if os.path.exists(abs_file) else 0
+                        st.session_state[chunks_key] = _cached_chunks(
+                            debug_tools, selected_file, file_mtime, _retrieval_cache_sig(debug_tools.vector_db_dir, debug_tools.embedding_model)
+                        )
                     except Exception as e:
                         st.error(f"❌ Error analyzing chunks: {e}")
+            
+            chunks = st.session_state.get(chunks_key)
+            if selected_file and chunks is not None:
+                st.subheader(f"📄 Chunks for: {selected_file}")
+                st.write(f"Found {len(chunks)} chunks")
+                
+                # Display one page of chunks per rerun
+                page_size = 20
+                total_pages = max(1, (len(chunks) + page_size - 1) // page_size)
+                page = 1
+                if total_pages > 1:
+                    page = st.number_input("Page", min_value=1, max_value=total_pages, value=1,
+                                           key=f"chunk_page::{selected_file}")
+                start = (page - 1) * page_size
+                for i, chunk in enumerate(chunks[start:start + page_size], start):
+                    # Short label; the full metadata is only rendered inside the expander
+                    metadata = chunk.get('metadata') or {}
+                    content = chunk.get('content', '')
+                    with st.expander(f"Chunk {i+1} · {metadata.get('source', '?')} · {len(content)} chars"):
+                        st.code(content, language='text')
+                        st.json(metadata, expanded=False)
         else:
             st.warning("No files available for analysis.")
     
+    @_fragment
     def _render_retrieval_tester(self, debug_tools):
         """Render retrieval testing tools."""
         st.header("🧪 Retrieval Tester")
@@ -453,46 +727,53 @@ class UIComponents:
             if st.button("🧪 Test Retrieval", type="primary") and test_query:
                 with st.spinner("Testing retrieval..."):
                     try:
-                        results = debug_tools.test_retrieval(test_query)
+                        st.subheader("🔍 Retrieval Results")
+                        status = st.empty()
+                        results_container = st.container()
                         
-                        if isinstance(results, list):
-                            st.subheader("🔍 Retrieval Results")
-                            st.write(f"Found {len(results)} relevant documents")
-                            
-                            for i, result in enumerate(results):
-                                with st.expander(f"Result {i+1} (Score: {result.get('relevance_score', 'N/A')})"):
-                                    st.write(f"**Source:** {result.get('source', 'Unknown')}")
-                                    st.code(result.get('content', ''), language='text')
-                                    st.write("**Metadata:**")
-                                    st.json(result.get('metadata', {}))
-                        elif isinstance(results, dict) and "error" in results:
-                            st.error(f"❌ Retrieval failed: {results['error']}")
+                        # Render each result as soon as it is produced
+                        count = 0
+                        error = None
+                        for result in debug_tools.iter_retrieval(test_query):
+                            if "error" in result:
+                                error = result["error"]
+                                break
+                            count += 1
+                            with results_container.expander(f"Result {count} (Score: {result.get('relevance_score', 'N/A')})"):
+                                st.write(f"**Source:** {result.get('source', 'Unknown')}")
+                                st.code(result.get('content', ''), language='text')
+                                st.write("**Metadata:**")
+                                st.json(result.get('metadata', {}))
+                            status.write(f"Streaming... {count} so far")
+                        
+                        if error:
+                            status.error(f"❌ Retrieval failed: {error}")
+                        elif count:
+                            status.write(f"Found {count} relevant documents")
                         else:
-                            st.warning(f"⚠️ Unexpected result format: {type(results)}")
+                            status.error("❌ Retrieval failed: No documents retrieved")
                                 
                     except Exception as e:
                         st.error(f"❌ Error testing retrieval: {e}")
         
         with col2:
             if st.button("📊 Test Multiple Queries"):
-                sample_queries = [
-                    "How does the MainActivity work?",
-                    "What are the main UI components?",
-                    "How is data passed between activities?",
-                    "What are the key configuration files?"
-                ]
-                
                 with st.spinner("Running multiple query tests..."):
                     try:
-                        results = debug_tools.test_multiple_queries(sample_queries)
+                        # Repeat runs against an unchanged index are served from cache
+                        db_sig = _retrieval_cache_sig(debug_tools.vector_db_dir, debug_tools.embedding_model)
+                        results = _cached_multiple_queries(debug_tools, _SAMPLE_QUERIES, db_sig)
                         
                         st.subheader("📊 Multiple Query Results")
                         for query, result in results.items():
                             with st.expander(f"Query: {query}"):
                                 if isinstance(result, list):
-                                    st.write(f"Documents found: {len(result)}")
-                                    for doc in result[:3]:  # Show top 3
-                                        st.write(f"- {doc.get('source', 'Unknown')} (Score: {doc.get('relevance_score', 'N/A')})")
+                                    # Count and top 3 documents in one markdown element
+                                    lines = "\n".join(
+                                        f"- `{doc.get('source', 'Unknown')}` (Score: {doc.get('relevance_score', 'N/A')})"
+                                        for doc in result[:3]
+                                    )
+                                    st.markdown(f"Documents found: {len(result)}\n\n{lines}")
                                 elif isinstance(result, dict) and "error" in result:
                                     st.error(f"Error: {result['error']}")
                                 else:
@@ -501,6 +782,7 @@ class UIComponents:
                     except Exception as e:
                         st.error(f"❌ Error testing multiple queries: {e}")
     
+    @_fragment
     def _render_build_status(self, project_config):
         """Render build status and statistics."""
         st.header("📈 Build Status")
@@ -511,31 +793,25 @@ class UIComponents:
             
             if os.path.exists(db_dir):
                 st.success("✅ Database exists")
+                if st.button("🔄 Refresh", key="refresh_build_status"):
+                    _build_stats.clear()
                 
-                # Count files
-                total_files = 0
-                for root, dirs, files in os.walk(db_dir):
-                    total_files += len(files)
+                # The directory mtime is part of the cache key so adding/removing DB files invalidates it
+                stats = _build_stats(db_dir, os.stat(db_dir).st_mtime_ns, project_config.is_remote_db())
                 
-                st.metric("Total Database Files", total_files)
+                st.metric("Total Database Files", stats["total_files"])
                 
                 # Check specific files
-                chroma_exists = os.path.exists(os.path.join(db_dir, "chroma.sqlite3"))
-                git_tracking_exists = os.path.exists(os.path.join(db_dir, "git_tracking.json"))
-                last_commit_exists = os.path.exists(os.path.join(db_dir, "last_commit.json"))
-                
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Chroma DB", "✅" if chroma_exists else "❌")
-                with col2:
-                    st.metric("Git Tracking", "✅" if git_tracking_exists else "❌")
-                with col3:
-                    st.metric("Last Commit", "✅" if last_commit_exists else "❌")
+                checks = [
+                    ("Chroma DB", stats["chroma"]),
+                    ("Git Tracking", stats["git_tracking"]),
+                    ("Last Commit", stats["last_commit"]),
+                ]
+                for col, (label, exists) in zip(st.columns(len(checks)), checks):
+                    col.metric(label, _STATUS_ICON[bool(exists)])
                 
                 # Show database size
-                import shutil
-                db_size = shutil.disk_usage(db_dir).used
-                st.metric("Database Size", f"{db_size / 1024 / 1024:.1f} MB")
+                st.metric("Database Size", f"{stats['size'] / 1024 / 1024:.1f} MB")
                 
             else:
                 st.warning("⚠️ Database does not exist")
@@ -543,6 +819,7 @@ class UIComponents:
         except Exception as e:
             st.error(f"❌ Error checking build status: {e}")
     
+    @_fragment
     def _render_logs_viewer(self, project_config):
         """Render logs viewer."""
         st.header("📝 Logs Viewer")
@@ -550,33 +827,49 @@ class UIComponents:
         try:
             logs_dir = project_config.get_logs_dir()
             
-            if os.path.exists(logs_dir):
-                log_files = [f for f in os.listdir(logs_dir) if f.endswith('.log')]
+            try:
+                log_paths = dict(_list_logs(logs_dir))
+            except FileNotFoundError:
+                st.warning("Logs directory does not exist.")
+                return
+            
+            if log_paths:
+                # Newest first so the most recent log is preselected
+                selected_log = st.selectbox("Select log file:", list(log_paths))
                 
-                if log_files:
-                    selected_log = st.selectbox("Select log file:", log_files)
+                if selected_log:
+                    log_path = log_paths[selected_log]
+                    tail_kb = st.number_input("Show last (KB):", min_value=16, max_value=16384,
+                                              value=256, step=64, key="log_tail_kb")
                     
-                    if selected_log:
-                        log_path = os.path.join(logs_dir, selected_log)
-                        
-                        # Show log content
-                        with open(log_path, 'r') as f:
-                            log_content = f.read()
-                        
-                        st.subheader(f"📄 {selected_log}")
-                        st.code(log_content, language='text')
-                        
-                        # Download button
+                    # Show only the tail of the log; re-read only when the file has changed
+                    log_stat = os.stat(log_path)
+                    size = log_stat.st_size
+                    window = int(tail_kb) * 1024
+                    log_tail = _read_log_tail(log_path, log_stat.st_mtime_ns, size, window)
+                    
+                    st.subheader(f"📄 {selected_log}")
+                    if size > window:
+                        st.caption(f"Showing last {tail_kb} KB of {size / 1024:.0f} KB")
+                    st.code(log_tail, language='text')
+                    
+                    # st.download_button reads its whole payload into memory and registers it with the media file
+                    # manager on every rerun, so the full file is only loaded once the user asks for it
+                    if (st.button(f"📥 Prepare Download ({size / 1024:.0f} KB)", key="w_prepare_log_download")
+                            or st.session_state.get("log_download_path") == log_path):
+                        st.session_state.log_download_path = log_path
+                        with open(log_path, 'rb') as f:
+                            log_bytes = f.read()
                         st.download_button(
-                            label="📥 Download Log",
-                            data=log_content,
+                            label=f"📥 Download Log ({len(log_bytes) / 1024:.0f} KB)",
+                            data=log_bytes,
                             file_name=selected_log,
-                            mime="text/plain"
+                            mime="text/plain",
+                            on_click=st.session_state.pop,
+                            args=("log_download_path", None)
                         )
-                else:
-                    st.info("No log files found.")
             else:
-                st.warning("Logs directory does not exist.")
+                st.info("No log files found.")
                 
         except Exception as e:
             st.error(f"❌ Error reading logs: {e}")
@@ -586,17 +879,22 @@ class UIComponents:
         with st.expander("🛠️ Processing Logs", expanded=debug_mode):
             st.markdown("**Real-time processing status:**")
             
-            # Get the logs from session state
-            logs = st.session_state.get('thinking_logs', [])
+            # Get the logs from session state, normalising a plain list or deque to ThinkingLogs
+            logs = st.session_state.get('thinking_logs')
+            if not isinstance(logs, ThinkingLogs):
+                logs = st.session_state['thinking_logs'] = new_thinking_logs(logs or ())
             
             if logs:
-                # Display logs as scrollable text area - each log on a new line
-                log_text = "\n".join(logs[-50:])  # Show last 50 logs to prevent overwhelming
+                # Display logs as scrollable text area - each log on a new line. The deque already holds
+                # only the last THINKING_LOGS_MAXLEN entries, so it is joined as-is, and only when its version changed.
+                if st.session_state.get("_logs_tail_sig") != logs.version:
+                    st.session_state._logs_tail_str = "\n".join(logs)
+                    st.session_state._logs_tail_sig = logs.version
                 
                 # Create scrollable text area with fixed height
                 st.text_area(
                     label="Processing Logs",
-                    value=log_text,
+                    value=st.session_state._logs_tail_str,
                     height=300,  # Fixed height to enable scrolling
                     disabled=True,  # Make it read-only
                     key="processing_logs_display",
@@ -609,14 +907,14 @@ class UIComponents:
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("🗑️ Clear Logs"):
-                    st.session_state.thinking_logs = []
+                    logs.clear()
                     st.rerun()
             
             with col2:
                 if st.button("📋 Copy Logs"):
                     if logs:
                         # This will show a text area that users can select and copy from
-                        st.code("\n".join(logs), language="text")
+                        st.code(st.session_state._logs_tail_str, language="text")
 
 # --------------- CODE CHANGE SUMMARY ---------------
 # REMOVED
@@ -12,6 +12,7 @@ import time
 import subprocess
 import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
 import json
 from datetime import datetime
@@ -28,56 +29,119 @@ try:
     from selenium.webdriver.support import expected_conditions as EC
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.chrome.service import Service
-    from selenium.common.exceptions import TimeoutException, NoSuchElementException
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
     from webdriver_manager.chrome import ChromeDriverManager
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
     print("⚠️ Selenium not available. Install with: pip install selenium webdriver-manager")
 
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+def _get_chromedriver_path():
+    """Resolve ChromeDriver through webdriver-manager once per process; later browser setups reuse the path."""
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            _chromedriver_path = ChromeDriverManager().install()
+        return _chromedriver_path
+
 class UIAutomationTestSuite:
     """UI Automation Test Suite using Selenium WebDriver with real functionality verification."""
     
+    # CSS locators shared across tests, defined once rather than rebuilt at each lookup
+    SELECTOR_CSS = "select, [role='combobox']"
+    SELECTBOX_CSS = "[data-testid='stSelectbox']"
+    BUTTON_CSS = "[data-testid='stButton'] button"
+    SUBMIT_CSS = BUTTON_CSS + ", [data-testid='stFormSubmitButton'] button"
+    STATUS_CSS = "[data-testid='stAlert'], [data-testid='stMarkdownContainer']"
+    PROGRESS_CSS = STATUS_CSS + ", [data-testid='stSpinner']"
+    TAB_CSS = "button[role='tab']"
+    BUILD_SUCCESS_KEYWORDS = ("successfully", "complete", "ready")
+    BUILD_FAILURE_KEYWORDS = ("error", "failed")
+    
     def __init__(self):
+        self._thread_state = threading.local()
+        self._log_lock = threading.Lock()
         self.driver = None
         self.app_process = None
         self.app_url = "http://localhost:8501"
         self.test_results = []
         self.log_file = f"ui_automation_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        # One buffered handle for the whole run; flushed at test boundaries and closed when the run ends
+        self._log_fh = open(self.log_file, 'a', buffering=1 << 16)
+    
+    @property
+    def driver(self):
+        """The WebDriver for the calling thread: a worker's own session during parallel tests, else the main one."""
+        return getattr(self._thread_state, "driver", None) or self._driver
+    
+    @driver.setter
+    def driver(self, value):
+        self._driver = value
         
     def log(self, message):
         """Log message to both console and file."""
         timestamp = datetime.now().strftime("%H:%M:%S")
         log_message = f"[{timestamp}] {message}"
-        print(log_message)
-        
-        with open(self.log_file, 'a') as f:
-            f.write(log_message + "\n")
+        # Parallel tests log from worker threads
+        with self._log_lock:
+            print(log_message)
+            self._log_fh.write(log_message + "\n")
+    
+    def flush_log(self):
+        """Push buffered log lines to the log file."""
+        with self._log_lock:
+            self._log_fh.flush()
         
     def setup_browser(self):
         """Setup Chrome browser with appropriate options."""
         if not SELENIUM_AVAILABLE:
             raise Exception("Selenium not available. Install with: pip install selenium webdriver-manager")
-            
+        
+        # Keep a browser that is still responding
+        if self.driver is not None:
+            try:
+                self.driver.current_url
+                return
+            except Exception:
+                self.driver = None
+        
+        self.driver = self._new_driver()
+        # No implicit wait: it would make every empty find_elements block for the full timeout.
+        # Required elements go through wait_for_element; optional ones through find_now.
+        
+        self.log(f"🔍 Browser setup complete. Chrome version: {self.driver.capabilities['browserVersion']}")
+        self.log(f"🔍 ChromeDriver version: {self.driver.capabilities['chrome']['chromedriverVersion'].split(' ')[0]}")
+    
+    def _new_driver(self):
+        """Start a new Chrome session with the suite's options."""
         chrome_options = Options()
-        # chrome_options.add_argument("--headless")  # Commented out to see browser
+        chrome_options.add_argument("--headless=new")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
         chrome_options.add_argument("--disable-web-security")
         chrome_options.add_argument("--allow-running-insecure-content")
+        # Nothing the tests check depends on images, extensions or background traffic
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
         
-        # Use webdriver-manager to automatically download and manage ChromeDriver
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.implicitly_wait(10)
-        
-        self.log(f"🔍 Browser setup complete. Chrome version: {self.driver.capabilities['browserVersion']}")
-        self.log(f"🔍 ChromeDriver version: {self.driver.capabilities['chrome']['chromedriverVersion'].split(' ')[0]}")
+        # Use webdriver-manager to automatically download and manage ChromeDriver (resolved once per process)
+        service = Service(_get_chromedriver_path())
+        return webdriver.Chrome(service=service, options=chrome_options)
         
     def start_streamlit_app(self):
         """Start the Streamlit app in background."""
+        # Reuse the app this suite already started while it is still running
+        if self.app_process is not None and self.app_process.poll() is None:
+            self.log(f"✅ Streamlit app already running at {self.app_url}")
+            return True
+        
         self.log("🚀 Starting Streamlit app...")
         
         # Kill any existing Streamlit processes
@@ -89,23 +153,28 @@ class UIAutomationTestSuite:
             
         # Start the app
         app_path = os.path.join(os.path.dirname(__file__), '..', '..', 'core', 'app.py')
-        self.app_process = subprocess.Popen(
-            ["streamlit", "run", app_path, "--server.port", "8501", "--server.headless", "true"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
+        # Send app output to a file: unread pipes fill up and block the server mid-test
+        with open(f"{self.log_file}.streamlit.out", "wb") as app_output:
+            self.app_process = subprocess.Popen(
+                ["streamlit", "run", app_path, "--server.port", "8501", "--server.headless", "true"],
+                stdout=app_output,
+                stderr=subprocess.STDOUT
+            )
         
-        # Wait for app to start
-        max_attempts = 30
-        for attempt in range(max_attempts):
-            try:
-                response = requests.get(f"{self.app_url}/_stcore/health", timeout=2)
-                if response.status_code == 200:
-                    self.log(f"✅ Streamlit app started at {self.app_url}")
-                    return True
-            except:
-                pass
-            time.sleep(1)
+        # Wait for app to start: probe fast at first, backing off to 1s, over one keep-alive session
+        deadline = time.monotonic() + 30
+        delay = 0.1
+        with requests.Session() as session:
+            while time.monotonic() < deadline:
+                try:
+                    response = session.get(f"{self.app_url}/_stcore/health", timeout=1)
+                    if response.status_code == 200:
+                        self.log(f"✅ Streamlit app started at {self.app_url}")
+                        return True
+                except requests.RequestException:
+                    pass
+                time.sleep(delay)
+                delay = min(delay * 1.5, 1.0)
             
         raise Exception("Failed to start Streamlit app")
         
@@ -118,6 +187,45 @@ class UIAutomationTestSuite:
             return element
         except TimeoutException:
             return None
+    
+    def wait_until(self, condition, timeout=10):
+        """Wait until condition(driver) holds instead of sleeping a fixed time; returns whether it did."""
+        try:
+            WebDriverWait(self.driver, timeout, ignored_exceptions=(StaleElementReferenceException,)).until(condition)
+            return True
+        except TimeoutException:
+            return False
+    
+    def find_now(self, by, value):
+        """Return matching elements immediately, without waiting; for checks where absence is acceptable."""
+        return self.driver.find_elements(by, value)
+    
+    @staticmethod
+    def _filter_by_text(elements, keywords):
+        """Keep elements whose visible text contains any keyword (case-insensitive), skipping re-rendered ones."""
+        matches = []
+        for element in elements:
+            try:
+                text = element.text.lower()
+            except StaleElementReferenceException:
+                continue
+            if any(keyword in text for keyword in keywords):
+                matches.append(element)
+        return matches
+    
+    def find_text_now(self, css, keywords):
+        """CSS lookup filtered on text, without waiting; replaces full-DOM //*[contains(text(), ...)] scans."""
+        return self._filter_by_text(self.find_now(By.CSS_SELECTOR, css), keywords)
+    
+    def wait_for_text_element(self, css, keywords, timeout=10):
+        """Wait for the first element matching css whose text contains any keyword."""
+        def first_match(driver):
+            matches = self._filter_by_text(driver.find_elements(By.CSS_SELECTOR, css), keywords)
+            return matches[0] if matches else False
+        try:
+            return WebDriverWait(self.driver, timeout).until(first_match)
+        except TimeoutException:
+            return None
             
     def test_app_startup_and_rag_build(self) -> Dict[str, Any]:
         """Test 1: App startup and RAG building process - following developer_test_suite.py pattern."""
@@ -134,7 +242,7 @@ class UIAutomationTestSuite:
             # Navigate to app
             self.log(f"🔍 Navigating to: {self.app_url}")
             self.driver.get(self.app_url)
-            time.sleep(5)
+            self.wait_until(lambda d: "Codebase-QA" in d.title, timeout=15)
             
             # Check if page loads
             if "Codebase-QA" in self.driver.title:
@@ -148,7 +256,7 @@ class UIAutomationTestSuite:
                 
             # Look for project type selector and select Android
             self.log("🔍 Looking for project type selector...")
-            project_selector = self.wait_for_element(By.CSS_SELECTOR, "select, [role='combobox']")
+            project_selector = self.wait_for_element(By.CSS_SELECTOR, self.SELECTOR_CSS)
             
             if project_selector:
                 self.log("✅ Project type selector found")
@@ -156,34 +264,37 @@ class UIAutomationTestSuite:
                 
                 # Click to open dropdown
                 project_selector.click()
-                time.sleep(2)
+                self.wait_until(EC.visibility_of_element_located((By.CSS_SELECTOR, "[role='listbox']")))
                 
                 # Look for Android option and select it
-                android_option = self.wait_for_element(By.XPATH, "//*[contains(text(), 'Android') or contains(text(), 'android')]")
+                android_option = self.wait_for_text_element("[role='option']", ("android",))
                 if android_option:
                     android_option.click()
-                    time.sleep(3)
+                    # Selecting a type reruns the app; wait for the choice to show up on the page
+                    self.wait_until(lambda d: "android" in d.find_element(By.TAG_NAME, "body").text.lower())
                     
                     # CRITICAL: Verify Android is actually selected by checking UI
                     self.log("🔍 Verifying Android selection in UI...")
                     
-                    # Method 1: Check if the selector shows "Android"
-                    selector_text = project_selector.text.lower()
-                    if "android" in selector_text:
+                    # Method 1 (selector shows "Android") and Method 2 ("android" anywhere in the UI)
+                    # are both read in one script run; the selector is looked up fresh since the rerun replaces it
+                    state = self.driver.execute_script(
+                        "const sel = document.querySelector(arguments[0]);"
+                        "return {sel_text: (sel && sel.innerText) || '', has_android: /android/i.test(document.body.innerText)};",
+                        self.SELECTBOX_CSS
+                    )
+                    if "android" in state["sel_text"].lower():
                         result["details"]["android_selected"] = True
                         self.log("✅ Android project type verified in selector")
+                    elif state["has_android"]:
+                        result["details"]["android_selected"] = True
+                        self.log("✅ Android project type verified in UI")
                     else:
-                        # Method 2: Look for "android" text anywhere in the UI
-                        android_indicators = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'android') or contains(text(), 'Android')]")
-                        if android_indicators:
-                            result["details"]["android_selected"] = True
-                            self.log("✅ Android project type verified in UI")
-                        else:
-                            result["details"]["android_selected"] = False
-                            result["status"] = "failed"
-                            result["error"] = "Android selection not verified in UI"
-                            self.log("❌ Android selection not verified in UI")
-                            return result
+                        result["details"]["android_selected"] = False
+                        result["status"] = "failed"
+                        result["error"] = "Android selection not verified in UI"
+                        self.log("❌ Android selection not verified in UI")
+                        return result
                 else:
                     result["details"]["android_selected"] = False
                     result["status"] = "failed"
@@ -201,7 +312,7 @@ class UIAutomationTestSuite:
             if result["details"].get("android_selected", False):
                 # Look for build button and trigger RAG build
                 self.log("🔍 Looking for build/rebuild button...")
-                build_button = self.wait_for_element(By.XPATH, "//*[contains(text(), 'Build') or contains(text(), 'Rebuild') or contains(text(), 'Index')]")
+                build_button = self.wait_for_text_element(self.BUTTON_CSS, ("build", "index"))
                 
                 if build_button:
                     result["details"]["build_button_found"] = True
@@ -209,10 +320,9 @@ class UIAutomationTestSuite:
                     
                     # Click build button
                     build_button.click()
-                    time.sleep(2)
                     
                     # Look for progress indicators
-                    progress_indicators = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Building') or contains(text(), 'Processing') or contains(text(), 'Loading')]")
+                    progress_indicators = self.wait_for_text_element(self.PROGRESS_CSS, ("building", "processing", "loading"), timeout=5)
                     
                     if progress_indicators:
                         result["details"]["progress_shown"] = True
@@ -221,15 +331,16 @@ class UIAutomationTestSuite:
                         result["details"]["progress_shown"] = False
                         self.log("⚠️ No progress indicators found")
                         
-                    # Wait for completion (up to 60 seconds)
-                    max_wait = 60
-                    for i in range(max_wait):
-                        success_messages = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'successfully') or contains(text(), 'complete') or contains(text(), 'ready')]")
-                        if success_messages:
-                            result["details"]["build_completed"] = True
-                            self.log("✅ RAG build completed")
-                            break
-                        time.sleep(1)
+                    # Wait for completion (up to 60 seconds); a terminal error ends the wait as well
+                    finished = self.wait_for_text_element(
+                        self.STATUS_CSS, self.BUILD_SUCCESS_KEYWORDS + self.BUILD_FAILURE_KEYWORDS, timeout=60
+                    )
+                    if finished and self._filter_by_text([finished], self.BUILD_SUCCESS_KEYWORDS):
+                        result["details"]["build_completed"] = True
+                        self.log("✅ RAG build completed")
+                    elif finished:
+                        result["details"]["build_completed"] = False
+                        self.log("❌ RAG build reported an error")
                     else:
                         result["details"]["build_completed"] = False
                         self.log("⚠️ Build completion not detected")
@@ -275,10 +386,9 @@ class UIAutomationTestSuite:
                 test_query = "What is the main activity?"
                 chat_input.clear()
                 chat_input.send_keys(test_query)
-                time.sleep(1)
                 
                 # Look for submit button
-                submit_button = self.wait_for_element(By.XPATH, "//*[contains(text(), 'Ask') or contains(text(), 'Submit') or contains(text(), 'Send')]")
+                submit_button = self.wait_for_text_element(self.SUBMIT_CSS, ("ask", "submit", "send"))
                 
                 if submit_button:
                     result["details"]["submit_button_found"] = True
@@ -286,10 +396,10 @@ class UIAutomationTestSuite:
                     
                     # Click submit
                     submit_button.click()
-                    time.sleep(5)
+                    self.wait_until(EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='stChatMessage']")), timeout=30)
                     
                     # Look for response
-                    response_elements = self.driver.find_elements(By.XPATH, "//*[contains(@class, 'chat') or contains(@class, 'message') or contains(@class, 'response')]")
+                    response_elements = self.find_now(By.CSS_SELECTOR, "[class*='chat'], [class*='message'], [class*='response']")
                     
                     if response_elements:
                         result["details"]["response_received"] = True
@@ -329,7 +439,7 @@ class UIAutomationTestSuite:
         
         try:
             # Look for debug tools expander
-            debug_expander = self.wait_for_element(By.XPATH, "//*[contains(text(), 'Debug') or contains(text(), 'Inspection')]")
+            debug_expander = self.wait_for_text_element("[data-testid='stExpander'] summary", ("debug", "inspection"))
             
             if debug_expander:
                 result["details"]["debug_section_found"] = True
@@ -337,10 +447,10 @@ class UIAutomationTestSuite:
                 
                 # Click to expand
                 debug_expander.click()
-                time.sleep(2)
+                self.wait_until(EC.presence_of_element_located((By.CSS_SELECTOR, self.TAB_CSS)), timeout=5)
                 
                 # Look for debug tabs
-                debug_tabs = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Vector DB') or contains(text(), 'Chunk') or contains(text(), 'Retrieval')]")
+                debug_tabs = self.find_text_now(self.TAB_CSS, ("vector db", "chunk", "retrieval"))
                 
                 if debug_tabs:
                     result["details"]["debug_tabs_found"] = True
@@ -349,7 +459,7 @@ class UIAutomationTestSuite:
                     # Test clicking on a debug tab
                     if len(debug_tabs) > 0:
                         debug_tabs[0].click()
-                        time.sleep(2)
+                        self.wait_until(lambda d: debug_tabs[0].get_attribute("aria-selected") == "true", timeout=5)
                         result["details"]["debug_tab_clicked"] = True
                         self.log("✅ Debug tab clicked")
                         
@@ -383,11 +493,15 @@ class UIAutomationTestSuite:
         }
         
         try:
-            # Check if session state is properly initialized
-            # Look for elements that indicate session state is working
-            session_indicators = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Project Type') or contains(text(), 'Android') or contains(text(), 'Ready')]")
+            # Both checks are answered by one script run over the page text instead of two element scans
+            found = self.driver.execute_script(
+                "const t = document.body.innerText;"
+                "return {session: /Project Type|Android|Ready/i.test(t), config: /Model|Embedding|Endpoint/i.test(t)};"
+            )
             
-            if session_indicators:
+            # Check if session state is properly initialized
+            # Look for text that indicates session state is working
+            if found["session"]:
                 result["details"]["session_state_working"] = True
                 self.log("✅ Session state indicators found")
             else:
@@ -395,9 +509,7 @@ class UIAutomationTestSuite:
                 self.log("⚠️ Session state indicators not found")
                 
             # Check for configuration elements
-            config_indicators = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Model') or contains(text(), 'Embedding') or contains(text(), 'Endpoint')]")
-            
-            if config_indicators:
+            if found["config"]:
                 result["details"]["configuration_visible"] = True
                 self.log("✅ Configuration elements visible")
             else:
@@ -414,6 +526,44 @@ class UIAutomationTestSuite:
             
         return result
         
+    def _select_android(self):
+        """Open the app in the current driver and choose the Android project type; returns whether it took."""
+        self.driver.get(self.app_url)
+        self.wait_until(lambda d: "Codebase-QA" in d.title, timeout=15)
+        project_selector = self.wait_for_element(By.CSS_SELECTOR, self.SELECTOR_CSS)
+        if not project_selector:
+            return False
+        project_selector.click()
+        android_option = self.wait_for_text_element("[role='option']", ("android",))
+        if not android_option:
+            return False
+        android_option.click()
+        return self.wait_until(lambda d: "android" in d.find_element(By.TAG_NAME, "body").text.lower())
+    
+    def _run_in_own_browser(self, test_name, test_func):
+        """Run a test in a browser session of its own, so independent tests can run side by side.
+        
+        Streamlit session state is per browser session, so the Android selection is repeated first;
+        the index built by test 1 is on disk and is simply loaded.
+        """
+        self.log(f"\n{'='*20} {test_name} {'='*20}")
+        driver = self._new_driver()
+        self._thread_state.driver = driver
+        try:
+            if not self._select_android():
+                self.log(f"⚠️ {test_name}: could not select Android in a new session")
+            return test_func()
+        except Exception as e:
+            self.log(f"❌ {test_name} failed: {e}")
+            return {"test_name": test_name, "status": "failed", "error": str(e), "details": {}}
+        finally:
+            self.flush_log()
+            self._thread_state.driver = None
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        
     def run_all_tests(self) -> List[Dict[str, Any]]:
         """Run all UI automation tests with real functionality verification."""
         self.log("🚀 STARTING UI AUTOMATION TEST SUITE")
@@ -428,34 +578,22 @@ class UIAutomationTestSuite:
             self.start_streamlit_app()
             self.log("✅ Streamlit app started")
             
-            # Run tests following developer_test_suite.py pattern
-            tests = [
-                ("App Startup and RAG Build", self.test_app_startup_and_rag_build),
+            # Run tests following developer_test_suite.py pattern. Test 1 selects the project type and
+            # builds the index; the others only inspect the UI and run in parallel afterwards
+            self.log(f"\n{'='*20} App Startup and RAG Build {'='*20}")
+            self.test_results.append(self.test_app_startup_and_rag_build())
+            self.flush_log()
+            
+            parallel_tests = [
                 ("Chat Functionality", self.test_chat_functionality),
                 ("Debug Tools Functionality", self.test_debug_tools_functionality),
                 ("Session State and Configuration", self.test_session_state_and_configuration)
             ]
-            
-            for test_name, test_func in tests:
-                self.log(f"\n{'='*20} {test_name} {'='*20}")
-                
-                # Check if browser is still responsive
-                try:
-                    # Simple check to see if browser is still working
-                    self.driver.current_url
-                except Exception as e:
-                    self.log(f"❌ Browser connection lost: {e}")
-                    self.log("🔄 Reconnecting browser...")
-                    try:
-                        self.driver.quit()
-                    except:
-                        pass
-                    self.setup_browser()
-                    self.driver.get(self.app_url)
-                    time.sleep(3)
-                
-                result = test_func()
-                self.test_results.append(result)
+            with ThreadPoolExecutor(max_workers=len(parallel_tests)) as pool:
+                futures = [pool.submit(self._run_in_own_browser, test_name, test_func)
+                           for test_name, test_func in parallel_tests]
+                # Results are reported in test order, whichever finishes first
+                self.test_results.extend(future.result() for future in futures)
                 
             # Generate report
             self.generate_report()
@@ -481,6 +619,8 @@ class UIAutomationTestSuite:
                     pass
                 
             self.log(f"📄 Complete log saved to: {self.log_file}")
+            with self._log_lock:
+                self._log_fh.close()
                 
     def generate_report(self):
         """Generate test report following developer_test_suite.py pattern."""
@@ -488,14 +628,20 @@ class UIAutomationTestSuite:
         self.log("📊 UI AUTOMATION TEST REPORT")
         self.log("="*50)
         
-        passed = sum(1 for result in self.test_results if result["status"] == "success")
-        failed = sum(1 for result in self.test_results if result["status"] == "failed")
+        # Tally in one pass over the results
+        passed = failed = 0
+        for result in self.test_results:
+            if result["status"] == "success":
+                passed += 1
+            elif result["status"] == "failed":
+                failed += 1
         total = len(self.test_results)
+        success_rate = (passed / total) * 100 if total else 0.0
         
         self.log(f"Total Tests: {total}")
         self.log(f"Passed: {passed}")
         self.log(f"Failed: {failed}")
-        self.log(f"Success Rate: {(passed/total)*100:.1f}%")
+        self.log(f"Success Rate: {success_rate:.1f}%")
         
         self.log("\n📋 DETAILED RESULTS:")
         for result in self.test_results:
@@ -518,12 +664,13 @@ class UIAutomationTestSuite:
                     "total": total,
                     "passed": passed,
                     "failed": failed,
-                    "success_rate": (passed/total)*100
+                    "success_rate": success_rate
                 },
                 "results": self.test_results
             }, f, indent=2)
             
         self.log(f"\n📄 Report saved: {report_file}")
+        self.flush_log()
 
 def main():
     """Main entry point for UI automation tests."""
@@ -7,17 +7,30 @@ Diagnoses and fixes the 'Collection expecting embedding with dimension of 768, g
 import os
 import sys
 import shutil
+import threading
+import time
 import requests
-from typing import Dict, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Optional
 
 # Add the core directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
 
 from config import ProjectConfig
-from logger import log_to_sublog, log_highlight
+from logger import log_highlight
+from test_helpers import BufferedSublog, flushes_log, loads_json
 
-class EmbeddingDimensionTest:
+REC_DIAGNOSE_FAILED = "❌ Cannot diagnose issue. Check Ollama connection."
+REC_FIX_FAILED = "❌ Cannot fix issue. Check file permissions."
+REC_INSTALL_FAILED = "❌ Cannot install embedding model. Run 'ollama pull nomic-embed-text' manually."
+REC_READY_FOR_REBUILD = "✅ Ready to rebuild RAG index. Restart the application."
+REC_MODEL_INSTALLED = "✅ Embedding model installed. Ready to rebuild RAG index."
+REC_UNKNOWN = "⚠️ Unknown state. Check logs for details."
+
+class EmbeddingDimensionTest(BufferedSublog):
     """Test and fix embedding dimension issues."""
+    LOG_NAME = "embedding_test.log"
     
     def __init__(self, project_dir: str, ollama_endpoint: str = "http://127.0.0.1:11434", is_streamlit_context: bool = False):
         self.project_dir = project_dir
@@ -35,10 +48,46 @@ class EmbeddingDimensionTest:
         
         os.makedirs(self.log_dir, exist_ok=True)
         
+        # One keep-alive session and a short-lived model list shared by diagnose and fix; the lock guards the
+        # cache, which a background model pull invalidates
+        self._session = requests.Session()
+        self._models_cache = None
+        self._models_lock = threading.Lock()
+        
+        # Sublog lines queued by _log() and written by _flush_log(); _log_local holds a background step's buffer
+        self._log_buffer = deque()
+        self._log_local = threading.local()
+        
+    def _get_available_models(self, max_age: float = 5.0) -> Optional[List[str]]:
+        """Model names from Ollama's /api/tags, reused for max_age seconds; None if Ollama answers with an error."""
+        with self._models_lock:
+            if self._models_cache and time.monotonic() - self._models_cache[0] < max_age:
+                return self._models_cache[1]
+            response = self._session.get(f"{self.ollama_endpoint}/api/tags", timeout=10)
+            if response.status_code != 200:
+                self._log(f"Ollama /api/tags returned {response.status_code}")
+                return None
+            models = loads_json(response.content).get("models") or []
+            models = [model["name"] for model in models if "name" in model]
+            self._models_cache = (time.monotonic(), models)
+            return models
+        
+    def _has_embedding_model(self) -> Optional[bool]:
+        """Whether a nomic-embed model is already pulled; None if Ollama cannot be reached."""
+        try:
+            available_models = self._get_available_models()
+        except requests.RequestException as e:
+            self._log(f"Embedding model probe failed: {e}")
+            return None
+        if available_models is None:
+            return None
+        return any("nomic-embed" in model.lower() for model in available_models)
+        
+    @flushes_log
     def diagnose_embedding_issue(self) -> Dict[str, Any]:
         """Diagnose the embedding dimension issue."""
         log_highlight("Diagnosing embedding dimension issue")
-        log_to_sublog(self.project_dir, "embedding_test.log", "=== EMBEDDING DIMENSION DIAGNOSIS ===")
+        self._log("=== EMBEDDING DIMENSION DIAGNOSIS ===")
         
         results = {
             "test_name": "embedding_dimension_diagnosis",
@@ -48,16 +97,13 @@ class EmbeddingDimensionTest:
         
         try:
             # Check Ollama models
-            response = requests.get(f"{self.ollama_endpoint}/api/tags", timeout=10)
-            if response.status_code != 200:
+            available_models = self._get_available_models()
+            if available_models is None:
                 results["status"] = "failed"
-                results["details"]["error"] = f"Ollama connection failed: {response.status_code}"
+                results["details"]["error"] = "Ollama connection failed"
                 return results
             
-            models_data = response.json()
-            available_models = [model.get("name", "") for model in models_data.get("models", [])]
-            
-            log_to_sublog(self.project_dir, "embedding_test.log", f"Available models: {available_models}")
+            self._log(f"Available models: {available_models}")
             results["details"]["available_models"] = available_models
             
             # Check for embedding models
@@ -67,36 +113,35 @@ class EmbeddingDimensionTest:
             # Check vector database directory
             vector_db_dir = self.project_config.get_db_dir()
             if os.path.exists(vector_db_dir):
-                log_to_sublog(self.project_dir, "embedding_test.log", f"Vector DB exists at: {vector_db_dir}")
+                self._log(f"Vector DB exists at: {vector_db_dir}")
                 results["details"]["vector_db_exists"] = True
                 results["details"]["vector_db_path"] = vector_db_dir
                 
                 # Check for Chroma files
-                chroma_files = []
-                if os.path.exists(vector_db_dir):
-                    for file in os.listdir(vector_db_dir):
-                        if file.endswith('.parquet') or file.endswith('.json'):
-                            chroma_files.append(file)
+                with os.scandir(vector_db_dir) as it:
+                    chroma_files = [entry.name for entry in it
+                                    if entry.is_file() and entry.name.endswith(('.parquet', '.json'))]
                 
                 results["details"]["chroma_files"] = chroma_files
-                log_to_sublog(self.project_dir, "embedding_test.log", f"Chroma files found: {chroma_files}")
+                self._log(f"Chroma files found: {chroma_files}")
             else:
                 results["details"]["vector_db_exists"] = False
-                log_to_sublog(self.project_dir, "embedding_test.log", "Vector DB does not exist")
+                self._log("Vector DB does not exist")
             
             results["status"] = "success"
             
         except Exception as e:
             results["status"] = "failed"
             results["details"]["error"] = str(e)
-            log_to_sublog(self.project_dir, "embedding_test.log", f"Diagnosis failed: {e}")
+            self._log(f"Diagnosis failed: {e}")
         
         return results
     
+    @flushes_log
     def fix_embedding_issue(self) -> Dict[str, Any]:
         """Fix the embedding dimension issue by clearing and rebuilding."""
         log_highlight("Fixing embedding dimension issue")
-        log_to_sublog(self.project_dir, "embedding_test.log", "=== EMBEDDING DIMENSION FIX ===")
+        self._log("=== EMBEDDING DIMENSION FIX ===")
         
         results = {
             "test_name": "embedding_dimension_fix",
@@ -108,32 +153,25 @@ class EmbeddingDimensionTest:
             # Step 1: Clear existing vector database
             vector_db_dir = self.project_config.get_db_dir()
             if os.path.exists(vector_db_dir):
-                log_to_sublog(self.project_dir, "embedding_test.log", f"Clearing vector DB: {vector_db_dir}")
+                self._log(f"Clearing vector DB: {vector_db_dir}")
                 shutil.rmtree(vector_db_dir)
                 results["details"]["vector_db_cleared"] = True
             else:
-                log_to_sublog(self.project_dir, "embedding_test.log", "Vector DB does not exist, nothing to clear")
+                self._log("Vector DB does not exist, nothing to clear")
                 results["details"]["vector_db_cleared"] = False
             
             # Step 2: Check if proper embedding model is available
-            response = requests.get(f"{self.ollama_endpoint}/api/tags", timeout=10)
-            if response.status_code == 200:
-                models_data = response.json()
-                available_models = [model.get("name", "") for model in models_data.get("models", [])]
-                
+            available_models = self._get_available_models()
+            if available_models is not None:
                 # Look for proper embedding model
-                embedding_model = None
-                for model in available_models:
-                    if "nomic-embed" in model.lower():
-                        embedding_model = model
-                        break
+                embedding_model = next((model for model in available_models if "nomic-embed" in model.lower()), None)
                 
                 if embedding_model:
-                    log_to_sublog(self.project_dir, "embedding_test.log", f"Found embedding model: {embedding_model}")
+                    self._log(f"Found embedding model: {embedding_model}")
                     results["details"]["embedding_model"] = embedding_model
                     results["status"] = "ready_for_rebuild"
                 else:
-                    log_to_sublog(self.project_dir, "embedding_test.log", "No proper embedding model found")
+                    self._log("No proper embedding model found")
                     results["details"]["embedding_model"] = None
                     results["status"] = "needs_embedding_model"
             else:
@@ -143,14 +181,15 @@ class EmbeddingDimensionTest:
         except Exception as e:
             results["status"] = "failed"
             results["details"]["error"] = str(e)
-            log_to_sublog(self.project_dir, "embedding_test.log", f"Fix failed: {e}")
+            self._log(f"Fix failed: {e}")
         
         return results
     
+    @flushes_log
     def install_embedding_model(self) -> Dict[str, Any]:
         """Install the proper embedding model."""
         log_highlight("Installing embedding model")
-        log_to_sublog(self.project_dir, "embedding_test.log", "=== INSTALLING EMBEDDING MODEL ===")
+        self._log("=== INSTALLING EMBEDDING MODEL ===")
         
         results = {
             "test_name": "install_embedding_model",
@@ -159,54 +198,99 @@ class EmbeddingDimensionTest:
         }
         
         try:
-            # Try to pull the embedding model
-            import subprocess
-            
-            log_to_sublog(self.project_dir, "embedding_test.log", "Pulling nomic-embed-text model...")
+            self._log("Pulling nomic-embed-text model...")
             
-            # Use subprocess to run ollama pull
-            result = subprocess.run(
-                ["ollama", "pull", "nomic-embed-text"],
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minutes timeout
-            )
+            # Pull through Ollama's streaming HTTP API; progress arrives as one JSON object per line
+            # ("model" for current Ollama releases, "name" for older ones). The pull gets its own session since
+            # run_complete_fix runs it on a worker thread while the shared session serves /api/tags lookups
+            statuses = []
+            last_decile = None
+            with requests.Session() as session, session.post(
+                f"{self.ollama_endpoint}/api/pull",
+                json={"model": "nomic-embed-text", "name": "nomic-embed-text", "stream": True},
+                stream=True,
+                timeout=600
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    progress = loads_json(line)
+                    if progress.get("error"):
+                        raise RuntimeError(progress["error"])
+                    status = progress.get("status", "")
+                    if not statuses or statuses[-1] != status:
+                        statuses.append(status)
+                        self._log(f"Pull status: {status}")
+                        # A pull can stream for minutes; write progress as it happens so a stall leaves a trace
+                        self._flush_log()
+                    if progress.get("total") and "completed" in progress:
+                        # Download updates arrive many times a second; log every 10%
+                        decile = progress["completed"] * 10 // progress["total"]
+                        if decile != last_decile:
+                            last_decile = decile
+                            self._log(f"Pull progress: {progress['completed']}/{progress['total']} bytes")
+                            self._flush_log()
             
-            if result.returncode == 0:
-                log_to_sublog(self.project_dir, "embedding_test.log", "Embedding model installed successfully")
+            if statuses and statuses[-1] == "success":
+                self._log("Embedding model installed successfully")
                 results["status"] = "success"
-                results["details"]["installation_output"] = result.stdout
+                results["details"]["installation_output"] = "\n".join(statuses)
+                # The model list changed
+                with self._models_lock:
+                    self._models_cache = None
             else:
-                log_to_sublog(self.project_dir, "embedding_test.log", f"Embedding model installation failed: {result.stderr}")
+                self._log(f"Embedding model installation did not finish: {statuses[-1:]}")
                 results["status"] = "failed"
-                results["details"]["error"] = result.stderr
+                results["details"]["error"] = f"Pull ended without success: {statuses[-1] if statuses else 'no response'}"
                 
         except Exception as e:
             results["status"] = "failed"
             results["details"]["error"] = str(e)
-            log_to_sublog(self.project_dir, "embedding_test.log", f"Installation failed: {e}")
+            self._log(f"Installation failed: {e}")
         
         return results
     
+    @flushes_log
     def run_complete_fix(self) -> Dict[str, Any]:
-        """Run complete fix for embedding dimension issue."""
-        log_highlight("Running complete embedding dimension fix")
-        log_to_sublog(self.project_dir, "embedding_test.log", "=== COMPLETE EMBEDDING FIX ===")
+        """Run complete fix for embedding dimension issue.
         
-        # Step 1: Diagnose
-        diagnosis = self.diagnose_embedding_issue()
-        log_to_sublog(self.project_dir, "embedding_test.log", f"Diagnosis result: {diagnosis['status']}")
+        A missing model is pulled on one worker thread while diagnose and fix run on the calling thread.
+        The pull uses its own HTTP session and only touches shared state through the locked model cache and
+        its own log buffer, which this thread writes out.
+        """
+        log_highlight("Running complete embedding dimension fix")
+        self._log("=== COMPLETE EMBEDDING FIX ===")
         
-        # Step 2: Fix
-        fix_result = self.fix_embedding_issue()
-        log_to_sublog(self.project_dir, "embedding_test.log", f"Fix result: {fix_result['status']}")
+        # One /api/tags lookup, cached for the probe, diagnosis and fix
+        has_model = self._has_embedding_model()
         
-        # Step 3: Install embedding model if needed
-        if fix_result["status"] == "needs_embedding_model":
-            install_result = self.install_embedding_model()
-            log_to_sublog(self.project_dir, "embedding_test.log", f"Installation result: {install_result['status']}")
-        else:
-            install_result = {"status": "skipped", "details": {"reason": "Embedding model already available"}}
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # Start pulling a missing model so the download overlaps diagnosis and the fix
+            install_future = None
+            if has_model is False:
+                install_future, install_log = self._submit_logged(pool, self.install_embedding_model)
+            
+            # Step 1: Diagnose
+            diagnosis = self.diagnose_embedding_issue()
+            self._log(f"Diagnosis result: {diagnosis['status']}")
+            
+            # Step 2: Fix (the vector DB is cleared on this thread)
+            fix_result = self.fix_embedding_issue()
+            self._log(f"Fix result: {fix_result['status']}")
+            self._flush_log()
+            
+            # Step 3: Wait for the pull, writing its progress from this thread as it arrives
+            if install_future:
+                while not wait([install_future], timeout=1.0).done:
+                    self._write_log(install_log)
+                self._write_log(install_log)
+                install_result = install_future.result()
+                self._log(f"Installation result: {install_result['status']}")
+            elif has_model:
+                install_result = {"status": "skipped", "details": {"reason": "Embedding model already available"}}
+            else:
+                install_result = {"status": "skipped", "details": {"reason": "Cannot connect to Ollama"}}
         
         return {
             "diagnosis": diagnosis,
@@ -215,24 +299,22 @@ class EmbeddingDimensionTest:
             "recommendation": self._get_recommendation(diagnosis, fix_result, install_result)
         }
     
+    # (step, status, recommendation) checked in order; the first match wins
+    _RECOMMENDATION_RULES = (
+        ("diagnosis", "failed", REC_DIAGNOSE_FAILED),
+        ("fix", "failed", REC_FIX_FAILED),
+        ("install", "failed", REC_INSTALL_FAILED),
+        ("fix", "ready_for_rebuild", REC_READY_FOR_REBUILD),
+        ("install", "success", REC_MODEL_INSTALLED),
+    )
+    
     def _get_recommendation(self, diagnosis: Dict, fix: Dict, install: Dict) -> str:
         """Get recommendation based on test results."""
-        if diagnosis["status"] == "failed":
-            return "❌ Cannot diagnose issue. Check Ollama connection."
-        
-        if fix["status"] == "failed":
-            return "❌ Cannot fix issue. Check file permissions."
-        
-        if install["status"] == "failed":
-            return "❌ Cannot install embedding model. Run 'ollama pull nomic-embed-text' manually."
-        
-        if fix["status"] == "ready_for_rebuild":
-            return "✅ Ready to rebuild RAG index. Restart the application."
-        
-        if install["status"] == "success":
-            return "✅ Embedding model installed. Ready to rebuild RAG index."
-        
-        return "⚠️ Unknown state. Check logs for details."
+        statuses = {"diagnosis": diagnosis["status"], "fix": fix["status"], "install": install["status"]}
+        for step, status, recommendation in self._RECOMMENDATION_RULES:
+            if statuses[step] == status:
+                return recommendation
+        return REC_UNKNOWN
 
 def main():
     """Main function to run embedding dimension test and fix."""
@@ -5,10 +5,13 @@ Tests answer quality, embedding compatibility, and logs all details for debuggin
 """
 
 import os
+import re
 import sys
+import threading
 import time
-import json
+import hashlib
 import requests
+from collections import deque
 from datetime import datetime
 from typing import Dict, List, Tuple, Any
 
@@ -18,10 +21,15 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
 from chat_handler import ChatHandler
 from rag_manager import RagManager
 from config import ProjectConfig
-from logger import log_to_sublog, log_highlight
+from logger import log_highlight
+from test_helpers import BufferedSublog, MockLogPlaceholder, flushes_log, loads_json, dump_json_file
 
-class QualityTestSuite:
+# Any bullet, dash or line break counts as a structured answer
+_STRUCTURE_MARKERS = re.compile(r"[•\-\n]")
+
+class QualityTestSuite(BufferedSublog):
     """Comprehensive testing suite for RAG system quality and debugging."""
+    LOG_NAME = "quality_test.log"
     
     def __init__(self, project_dir: str, ollama_model: str = "llama3.1", ollama_endpoint: str = "http://127.0.0.1:11434", is_streamlit_context: bool = False):
         self.project_dir = project_dir
@@ -41,10 +49,21 @@ class QualityTestSuite:
         
         os.makedirs(self.log_dir, exist_ok=True)
         
+        # Sublog lines queued by _log() and written by _flush_log(); _log_local holds a background step's buffer
+        self._log_buffer = deque()
+        self._log_local = threading.local()
+    
+    @property
+    def _embedding_cache_dir(self) -> str:
+        """Per-project on-disk cache of chunk embeddings, kept across suite runs."""
+        project_key = hashlib.sha256(os.path.abspath(self.project_dir).encode()).hexdigest()[:16]
+        return os.path.join(os.path.expanduser("~"), ".cache", "codebase-qa", project_key, "embeddings")
+        
+    @flushes_log
     def test_embedding_compatibility(self) -> Dict[str, Any]:
         """Test embedding model compatibility and dimensions."""
         log_highlight("Testing embedding compatibility")
-        log_to_sublog(self.project_dir, "quality_test.log", "=== EMBEDDING COMPATIBILITY TEST ===")
+        self._log("=== EMBEDDING COMPATIBILITY TEST ===")
         
         results = {
             "test_name": "embedding_compatibility",
@@ -57,46 +76,47 @@ class QualityTestSuite:
         
         try:
             # Test 1: Check if Ollama is running
-            log_to_sublog(self.project_dir, "quality_test.log", "Testing Ollama connectivity...")
+            self._log("Testing Ollama connectivity...")
             response = requests.get(f"{self.ollama_endpoint}/api/tags", timeout=10)
             if response.status_code != 200:
                 results["status"] = "failed"
                 results["details"]["ollama_connection"] = f"Failed: {response.status_code}"
-                log_to_sublog(self.project_dir, "quality_test.log", f"Ollama connection failed: {response.status_code}")
+                self._log(f"Ollama connection failed: {response.status_code}")
                 return results
             
-            log_to_sublog(self.project_dir, "quality_test.log", "Ollama is running")
+            self._log("Ollama is running")
             results["details"]["ollama_connection"] = "success"
             
             # Test 2: Check available models
-            models_data = response.json()
-            available_models = [model.get("name", "") for model in models_data.get("models", [])]
-            log_to_sublog(self.project_dir, "quality_test.log", f"Available models: {available_models}")
+            models_data = loads_json(response.content)
+            models = models_data.get("models") or []
+            available_models = [model["name"] for model in models if "name" in model]
+            self._log(f"Available models: {available_models}")
             results["details"]["available_models"] = available_models
             
             # Test 3: Check if embedding model exists
-            embedding_models = [model for model in available_models if "nomic-embed" in model.lower()]
-            if embedding_models:
-                embedding_model = embedding_models[0]
-                log_to_sublog(self.project_dir, "quality_test.log", f"Embedding model {embedding_model} is available")
+            embedding_model = next((model for model in available_models if "nomic-embed" in model.lower()), None)
+            if embedding_model:
+                self._log(f"Embedding model {embedding_model} is available")
                 results["details"]["embedding_model"] = "available"
                 results["status"] = "success"
             else:
-                log_to_sublog(self.project_dir, "quality_test.log", f"Embedding model not found")
+                self._log(f"Embedding model not found")
                 results["details"]["embedding_model"] = "not_found"
                 results["status"] = "warning"
                 
         except Exception as e:
             results["status"] = "failed"
             results["details"]["error"] = str(e)
-            log_to_sublog(self.project_dir, "quality_test.log", f"Embedding compatibility test failed: {e}")
+            self._log(f"Embedding compatibility test failed: {e}")
             
         return results
     
+    @flushes_log
     def test_rag_building(self) -> Dict[str, Any]:
         """Test RAG building process and log all details."""
         log_highlight("Testing RAG building process")
-        log_to_sublog(self.project_dir, "quality_test.log", "=== RAG BUILDING TEST ===")
+        self._log("=== RAG BUILDING TEST ===")
         
         results = {
             "test_name": "rag_building",
@@ -120,33 +140,21 @@ class QualityTestSuite:
             rag_manager = RagManager()
             
             # Test RAG building
-            log_to_sublog(self.project_dir, "quality_test.log", "Starting RAG building test...")
+            self._log("Starting RAG building test...")
             start_time = time.time()
             
-            # Create a mock log placeholder for non-streamlit context
-            class MockLogPlaceholder:
-                def empty(self):
-                    pass
-                def container(self):
-                    return self
-                def text_area(self, *args, **kwargs):
-                    pass
-                def __enter__(self):
-                    return self
-                def __exit__(self, exc_type, exc_val, exc_tb):
-                    pass
-            
             # Build RAG index
             retriever, qa_chain = rag_manager.build_rag_index(
                 self.project_dir, 
                 self.ollama_model, 
                 self.ollama_endpoint, 
                 "android", 
-                MockLogPlaceholder()
+                MockLogPlaceholder(),
+                embedding_cache_dir=self._embedding_cache_dir
             )
             
             build_time = time.time() - start_time
-            log_to_sublog(self.project_dir, "quality_test.log", f"RAG building completed in {build_time:.2f}s")
+            self._log(f"RAG building completed in {build_time:.2f}s")
             
             results["status"] = "success"
             results["details"]["build_time"] = build_time
@@ -160,14 +168,23 @@ class QualityTestSuite:
         except Exception as e:
             results["status"] = "failed"
             results["details"]["error"] = str(e)
-            log_to_sublog(self.project_dir, "quality_test.log", f"RAG building test failed: {e}")
+            self._log(f"RAG building test failed: {e}")
             
         return results
     
-    def test_question_quality(self, question: str, expected_rating: int = 4) -> Dict[str, Any]:
-        """Test answer quality for a specific question."""
+    def _create_chat_handler(self) -> ChatHandler:
+        """Set up the LLM and a ChatHandler for answering test questions."""
+        return ChatHandler(
+            llm=RagManager().setup_llm(self.ollama_model, self.ollama_endpoint),
+            project_config=self.project_config,
+            project_dir=self.project_dir
+        )
+    
+    @flushes_log
+    def test_question_quality(self, question: str, expected_rating: int = 4, chat_handler: ChatHandler = None) -> Dict[str, Any]:
+        """Test answer quality for a specific question, reusing chat_handler when one is given."""
         log_highlight(f"Testing question quality: {question}")
-        log_to_sublog(self.project_dir, "quality_test.log", f"=== QUESTION QUALITY TEST: {question} ===")
+        self._log(f"=== QUESTION QUALITY TEST: {question} ===")
         
         results = {
             "test_name": "question_quality",
@@ -179,12 +196,9 @@ class QualityTestSuite:
         }
         
         try:
-            # Initialize chat handler
-            chat_handler = ChatHandler(
-                llm=RagManager().setup_llm(self.ollama_model, self.ollama_endpoint),
-                project_config=self.project_config,
-                project_dir=self.project_dir
-            )
+            # Initialize chat handler unless the caller shares one across questions
+            if chat_handler is None:
+                chat_handler = self._create_chat_handler()
             
             # Create mock session state for non-streamlit context
             if not self.is_streamlit_context:
@@ -197,22 +211,9 @@ class QualityTestSuite:
                     st.session_state.qa_chain = None
             
             # Process the question
-            log_to_sublog(self.project_dir, "quality_test.log", f"Processing question: {question}")
+            self._log(f"Processing question: {question}")
             start_time = time.time()
             
-            # Create mock log placeholder
-            class MockLogPlaceholder:
-                def empty(self):
-                    pass
-                def container(self):
-                    return self
-                def text_area(self, *args, **kwargs):
-                    pass
-                def __enter__(self):
-                    return self
-                def __exit__(self, exc_type, exc_val, exc_tb):
-                    pass
-            
             # Store qa_chain in session state for chat_handler to use
             if not self.is_streamlit_context:
                 import streamlit as st
@@ -223,7 +224,7 @@ class QualityTestSuite:
             )
             
             processing_time = time.time() - start_time
-            log_to_sublog(self.project_dir, "quality_test.log", f"Question processed in {processing_time:.2f}s")
+            self._log(f"Question processed in {processing_time:.2f}s")
             
             # Analyze answer quality
             quality_metrics = self._analyze_answer_quality(answer, metadata, reranked_docs)
@@ -250,15 +251,25 @@ class QualityTestSuite:
             satisfaction_rating = self._calculate_satisfaction_rating(quality_metrics, expected_rating)
             results["details"]["satisfaction_rating"] = satisfaction_rating
             
-            log_to_sublog(self.project_dir, "quality_test.log", f"Quality analysis completed. Satisfaction rating: {satisfaction_rating}/10")
+            self._log(f"Quality analysis completed. Satisfaction rating: {satisfaction_rating}/10")
             
         except Exception as e:
             results["status"] = "failed"
             results["details"]["error"] = str(e)
-            log_to_sublog(self.project_dir, "quality_test.log", f"Question quality test failed: {e}")
+            self._log(f"Question quality test failed: {e}")
             
         return results
     
+    @flushes_log
+    def test_questions_batch(self, questions: List[str], chat_handler: ChatHandler = None) -> List[Dict[str, Any]]:
+        """Run test_question_quality for each question in order, sharing one chat handler.
+        
+        Questions run one at a time: they share a single Ollama instance and the thinking_logs session
+        state, so concurrent runs would skew each question's processing_time and interleave its logs.
+        """
+        self._log(f"Running {len(questions)} questions")
+        return [self.test_question_quality(question, chat_handler=chat_handler) for question in questions]
+    
     def _analyze_answer_quality(self, answer: str, metadata: Dict, source_docs: List) -> Dict[str, Any]:
         """Analyze the quality of an answer."""
         metrics = {
@@ -282,7 +293,7 @@ class QualityTestSuite:
             metrics["completeness_score"] = 2
         
         # Clarity score (based on answer structure)
-        if "•" in answer or "-" in answer or "\n" in answer:
+        if _STRUCTURE_MARKERS.search(answer):
             metrics["clarity_score"] = 8
         elif len(answer) > 100:
             metrics["clarity_score"] = 6
@@ -310,10 +321,11 @@ class QualityTestSuite:
         else:
             return max(1, int(avg_score * 0.8))  # Penalty for not meeting expectations
     
+    @flushes_log
     def run_comprehensive_test(self) -> Dict[str, Any]:
         """Run comprehensive test suite."""
         log_highlight("Starting comprehensive quality test suite")
-        log_to_sublog(self.project_dir, "quality_test.log", "=== COMPREHENSIVE QUALITY TEST SUITE ===")
+        self._log("=== COMPREHENSIVE QUALITY TEST SUITE ===")
         
         test_suite_results = {
             "timestamp": datetime.now().isoformat(),
@@ -339,16 +351,21 @@ class QualityTestSuite:
             "List down the project directory file structure"
         ]
         
-        for question in test_questions:
-            question_test = self.test_question_quality(question)
-            test_suite_results["tests"].append(question_test)
+        # One LLM and chat handler serve every question; if setup fails here, each question
+        # retries it and records the error in its own result
+        chat_handler = None
+        if rag_test["status"] == "success":
+            try:
+                chat_handler = self._create_chat_handler()
+            except Exception as e:
+                self._log(f"Shared chat handler setup failed: {e}")
+        test_suite_results["tests"].extend(self.test_questions_batch(test_questions, chat_handler=chat_handler))
         
         # Save comprehensive results
         results_file = os.path.join(self.log_dir, "comprehensive_test_results.json")
-        with open(results_file, 'w') as f:
-            json.dump(test_suite_results, f, indent=2)
+        dump_json_file(test_suite_results, results_file)
         
-        log_to_sublog(self.project_dir, "quality_test.log", f"Comprehensive test completed. Results saved to {results_file}")
+        self._log(f"Comprehensive test completed. Results saved to {results_file}")
         
         return test_suite_results
 
@@ -8,18 +8,43 @@ used across multiple test suites. It follows clean code principles by keeping
 files focused and under 250 lines.
 
 Usage:
-    from test_helpers import MockSessionState, MockLogPlaceholder, TestConfig
+    from test_helpers import MockSessionState, MockLogPlaceholder, TestConfig, BufferedSublog, flushes_log, loads_json
 """
 
 import os
 import sys
 import json
+import functools
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any, Optional
 
 # Add the core directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
 
+from logger import log_to_sublog
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def loads_json(data):
+    """Parse JSON from bytes or str, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dump_json_file(obj, path: str):
+    """Write obj as indented JSON to path, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
+
 class MockSessionState:
     """Mock Streamlit session state for testing outside Streamlit context."""
     
@@ -61,6 +86,10 @@ class MockSessionState:
 class MockLogPlaceholder:
     """Mock Streamlit placeholder for testing logging functionality."""
     
+    def empty(self):
+        """Mock clear - does nothing."""
+        pass
+    
     def container(self):
         """Return self as container."""
         return self
@@ -69,6 +98,10 @@ class MockLogPlaceholder:
         """Mock text area - does nothing."""
         pass
     
+    def code(self, *args, **kwargs):
+        """Mock code block - does nothing."""
+        pass
+    
     def __enter__(self):
         """Context manager entry."""
         return self
@@ -165,6 +198,58 @@ class TestResult:
             self.details.update(details)
 
 
+class BufferedSublog:
+    """Mixin that buffers a suite's sublog lines and writes them with one log_to_sublog call per flush.
+    
+    Subclasses set LOG_NAME, and project_dir, _log_buffer (a deque) and _log_local (a threading.local) in
+    __init__; test methods wrapped in flushes_log flush when they finish.
+    """
+    LOG_NAME = "test.log"
+    
+    def _log(self, message: str):
+        """Queue a line for LOG_NAME; a step started with _submit_logged queues into its own buffer."""
+        getattr(self._log_local, "buffer", self._log_buffer).append(message.rstrip())
+    
+    def _flush_log(self):
+        """Write all queued lines to LOG_NAME at once; a background step leaves this to its coordinating thread."""
+        if not hasattr(self._log_local, "buffer"):
+            self._write_log(self._log_buffer)
+    
+    def _write_log(self, buffer: deque):
+        """Drain buffer into LOG_NAME with one log_to_sublog call."""
+        lines = []
+        while buffer:
+            lines.append(buffer.popleft())
+        if lines:
+            log_to_sublog(self.project_dir, self.LOG_NAME, "\n".join(lines))
+    
+    def _submit_logged(self, pool, method, *args, **kwargs):
+        """Submit method to pool with its log lines kept apart; returns (future, buffer).
+        
+        The coordinating thread writes the buffer with _write_log, so the step's lines are not mixed into
+        sections the coordinator is logging meanwhile.
+        """
+        buffer = deque()
+        def run():
+            self._log_local.buffer = buffer
+            try:
+                return method(*args, **kwargs)
+            finally:
+                del self._log_local.buffer
+        return pool.submit(run), buffer
+
+
+def flushes_log(method):
+    """Flush the instance's buffered sublog lines when the wrapped test method returns or raises."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._flush_log()
+    return wrapper
+
+
 def create_test_logger(project_dir: str, log_file: str = "test.log"):
     """Create a test logger that writes to a test-specific log file."""
     log_path = os.path.join(project_dir, "logs", log_file)
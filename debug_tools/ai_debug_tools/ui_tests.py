@@ -124,17 +124,6 @@ class UITests:
             st.session_state.setdefault("rag_building_in_progress", False)
             st.session_state.setdefault("rag_build_start_time", None)
             
-            # Create a mock log placeholder for testing
-            class MockLogPlaceholder:
-                def container(self):
-                    return self
-                def text_area(self, *args, **kwargs):
-                    pass
-                def __enter__(self):
-                    return self
-                def __exit__(self, exc_type, exc_val, exc_tb):
-                    pass
-            
             mock_placeholder = MockLogPlaceholder()
             
             # Test RAG manager
@@ -249,17 +238,6 @@ class UITests:
             st.session_state.setdefault("rag_building_in_progress", False)
             st.session_state.setdefault("rag_build_start_time", None)
             
-            # Create a mock log placeholder
-            class MockLogPlaceholder:
-                def container(self):
-                    return self
-                def text_area(self, *args, **kwargs):
-                    pass
-                def __enter__(self):
-                    return self
-                def __exit__(self, exc_type, exc_val, exc_tb):
-                    pass
-            
             mock_placeholder = MockLogPlaceholder()
             
             # Test RAG manager
@@ -6,6 +6,7 @@ import os
 import sys
 import json
 import streamlit as st
+from collections import Counter
 from typing import List, Dict, Any
 
 # Add parent directory to path to import from codebase-qa root
@@ -74,38 +75,35 @@ def analyze_chunks(project_config, retriever=None):
             st.error("❌ Could not access vectorstore from retriever")
             return
         
-        # Get all documents from the vectorstore
+        # Only metadatas are analyzed, so leave documents and embeddings in Chroma
         collection = vectorstore._collection
-        results = collection.get()
-        documents = results.get('documents', [])
+        results = collection.get(include=["metadatas"])
         metadatas = results.get('metadatas', [])
         
-        st.write(f"**📊 Total chunks in database: {len(documents)}**")
+        st.write(f"**📊 Total chunks in database: {len(metadatas)}**")
         
         # Analyze chunk distribution by file
-        file_distribution = {}
-        for metadata in metadatas:
-            if metadata and 'source' in metadata:
-                source = metadata['source']
-                file_distribution[source] = file_distribution.get(source, 0) + 1
+        file_distribution = Counter(
+            metadata['source'] for metadata in metadatas if metadata and 'source' in metadata
+        )
         
         st.write(f"**📁 Files with chunks: {len(file_distribution)}**")
         
-        # Show top files by chunk count
-        top_files = sorted(file_distribution.items(), key=lambda x: x[1], reverse=True)[:10]
+        # Show top files by chunk count (heap selection rather than a full sort)
+        top_files = file_distribution.most_common(10)
         st.write("**📈 Top files by chunk count:**")
-        for file_path, count in top_files:
-            st.write(f"  • {file_path}: {count} chunks")
+        # One markdown element per list instead of one st.write per row
+        st.markdown("\n".join(f"- {file_path}: {count} chunks" for file_path, count in top_files))
         
         # Show processed files vs all project files
         processed_files = get_available_files(project_config)
         if processed_files:
             st.write(f"**📋 Actually processed files: {len(processed_files)}**")
             st.write("These are the files that were actually processed and indexed:")
-            for file_path in processed_files[:10]:  # Show first 10
-                st.write(f"  • {file_path}")
+            lines = [f"- {file_path}" for file_path in processed_files[:10]]  # Show first 10
             if len(processed_files) > 10:
-                st.write(f"  ... and {len(processed_files) - 10} more files")
+                lines.append(f"- ... and {len(processed_files) - 10} more files")
+            st.markdown("\n".join(lines))
         
         # Analyze anchor quality
         analyze_anchor_quality_from_metadata(metadatas)
@@ -201,8 +199,7 @@ def analyze_anchor_quality_from_metadata(metadatas):
     col1, col2 = st.columns(2)
     with col1:
         st.write("**Anchor Distribution:**")
-        for anchor_type, count in anchor_counts.items():
-            st.write(f"  • {anchor_type}: {count}")
+        st.markdown("\n".join(f"- {anchor_type}: {count}" for anchor_type, count in anchor_counts.items()))
     
     with col2:
         st.write("**Quality Metrics:**")
@@ -210,8 +207,8 @@ def analyze_anchor_quality_from_metadata(metadatas):
         if total_chunks > 0:
             anchored_chunks = total_chunks - anchor_counts["no_anchors"]
             anchor_coverage = (anchored_chunks / total_chunks) * 100
-            st.write(f"  • Anchor coverage: {anchor_coverage:.1f}%")
-            st.write(f"  • Anchored chunks: {anchored_chunks}/{total_chunks}")
+            st.markdown(f"- Anchor coverage: {anchor_coverage:.1f}%\n"
+                        f"- Anchored chunks: {anchored_chunks}/{total_chunks}")
 
 def analyze_chunk_distribution(hierarchy):
     """Analyze how chunks are distributed across files."""
@@ -244,15 +241,15 @@ def analyze_chunk_distribution(hierarchy):
         min_chunks = min(chunk_counts)
         
         st.write(f"**Statistics:**")
-        st.write(f"  • Average chunks per file: {avg_chunks:.1f}")
-        st.write(f"  • Max chunks in a file: {max_chunks}")
-        st.write(f"  • Min chunks in a file: {min_chunks}")
-        st.write(f"  • Total files: {len(chunk_counts)}")
+        st.markdown(f"- Average chunks per file: {avg_chunks:.1f}\n"
+                    f"- Max chunks in a file: {max_chunks}\n"
+                    f"- Min chunks in a file: {min_chunks}\n"
+                    f"- Total files: {len(chunk_counts)}")
     
     if file_types:
         st.write(f"**Distribution by file type:**")
-        for ext, info in file_types.items():
-            st.write(f"  • {ext}: {info['files']} files, {info['total_chunks']} chunks")
+        st.markdown("\n".join(f"- {ext}: {info['files']} files, {info['total_chunks']} chunks"
+                              for ext, info in file_types.items()))
 
 def analyze_file_coverage(hierarchy, project_config):
     """Analyze file coverage and identify missing files."""
@@ -260,14 +257,15 @@ def analyze_file_coverage(hierarchy, project_config):
     
     # Get all files in project
     all_files = set()
-    extensions = project_config.get_extensions()
+    # A tuple lets str.endswith test every extension in one call
+    extensions = project_config.extensions_tuple
     
     for root, dirs, files in os.walk(project_config.project_dir):
         if 'codebase-qa' in dirs:
             dirs.remove('codebase-qa')
         
         for filename in files:
-            if any(filename.endswith(ext) for ext in extensions):
+            if filename.endswith(extensions):
                 rel_path = os.path.relpath(os.path.join(root, filename), project_config.project_dir)
                 all_files.add(rel_path)
     
@@ -280,15 +278,14 @@ def analyze_file_coverage(hierarchy, project_config):
     missing_files = all_files - indexed_files
     
     st.write(f"**Coverage Statistics:**")
-    st.write(f"  • Total project files: {len(all_files)}")
-    st.write(f"  • Indexed files: {len(indexed_files)}")
-    st.write(f"  • Coverage: {(len(covered_files) / len(all_files) * 100):.1f}%")
-    st.write(f"  • Missing files: {len(missing_files)}")
+    st.markdown(f"- Total project files: {len(all_files)}\n"
+                f"- Indexed files: {len(indexed_files)}\n"
+                f"- Coverage: {(len(covered_files) / len(all_files) * 100):.1f}%\n"
+                f"- Missing files: {len(missing_files)}")
     
     if missing_files:
         st.write(f"**Missing files (first 10):**")
-        for file_path in sorted(list(missing_files))[:10]:
-            st.write(f"  • {file_path}")
+        st.markdown("\n".join(f"- {file_path}" for file_path in sorted(missing_files)[:10]))
 
 def analyze_retrieval_patterns(retriever, project_config):
     """Analyze retrieval patterns and performance."""
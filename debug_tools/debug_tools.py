@@ -4,13 +4,16 @@ import streamlit as st
 import json
 import time
 import requests
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from langchain.docstore.document import Document
-from langchain_ollama import OllamaEmbeddings
-from langchain_community.vectorstores import Chroma
 
 # Add parent directory to path to import from codebase-qa root
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import ProjectConfig
+from fs_walk import iter_files, tree_stats
 from model_config import model_config
 from logger import log_highlight, log_to_sublog
 from rag_manager import RagManager
@@ -176,35 +179,24 @@ class DebugTools:
                 log_to_sublog(self.project_dir, "debug_tools.log", f"❌ Error getting collection count: {e}")
                 return {"error": f"Error getting collection count: {e}"}
             
-            # Get all documents
+            # Analyze file distribution from metadata only; documents and embeddings stay in Chroma
             try:
-                results = collection.get()
-                documents = results.get('documents', [])
-                metadatas = results.get('metadatas', [])
-                log_to_sublog(self.project_dir, "debug_tools.log", f"Retrieved {len(documents)} documents, {len(metadatas)} metadatas")
+                file_distribution = Counter(
+                    metadata['source'] for metadata in self._iter_metadatas(collection, count)
+                    if metadata and 'source' in metadata
+                )
+                log_to_sublog(self.project_dir, "debug_tools.log", f"Scanned metadatas for {count} documents")
             except Exception as e:
-                log_to_sublog(self.project_dir, "debug_tools.log", f"❌ Error getting documents from collection: {e}")
-                return {"error": f"Error getting documents from collection: {e}"}
-            
-            # Analyze file distribution
-            file_distribution = {}
-            for metadata in metadatas:
-                if metadata and 'source' in metadata:
-                    source = metadata['source']
-                    file_distribution[source] = file_distribution.get(source, 0) + 1
+                log_to_sublog(self.project_dir, "debug_tools.log", f"❌ Error getting metadatas from collection: {e}")
+                return {"error": f"Error getting metadatas from collection: {e}"}
             
             # Get database size
-            db_size = 0
-            if os.path.exists(self.vector_db_dir):
-                for root, dirs, files in os.walk(self.vector_db_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        db_size += os.path.getsize(file_path)
+            db_size = tree_stats(self.vector_db_dir).total_bytes if os.path.exists(self.vector_db_dir) else 0
             
             result = {
                 "total_documents": count,
                 "unique_files": len(file_distribution),
-                "file_distribution": file_distribution,
+                "file_distribution": dict(file_distribution),
                 "database_size_mb": db_size / (1024 * 1024),
                 "embedding_model": self.embedding_model,
                 "database_path": self.vector_db_dir
@@ -222,6 +214,11 @@ class DebugTools:
             log_to_sublog(self.project_dir, "debug_tools.log", f"Traceback: {traceback.format_exc()}")
             return {"error": str(e)}
     
+    def _iter_metadatas(self, collection, count, page_size=10000):
+        """Yield chunk metadatas page by page, fetching neither documents nor embeddings."""
+        for offset in range(0, count, page_size):
+            yield from collection.get(include=["metadatas"], limit=page_size, offset=offset).get('metadatas') or []
+    
     def clear_vector_db(self):
         """Clear the vector database."""
         try:
@@ -229,7 +226,11 @@ class DebugTools:
             if os.path.exists(self.vector_db_dir):
                 log_to_sublog(self.project_dir, "debug_tools.log", 
                              f"Clearing vector DB: {self.vector_db_dir}")
-                shutil.rmtree(self.vector_db_dir)
+                # Rename out of the way atomically, then delete off the render thread
+                trash = f"{self.vector_db_dir}.trash.{os.getpid()}.{int(time.time())}"
+                os.replace(self.vector_db_dir, trash)
+                threading.Thread(target=shutil.rmtree, args=(trash,),
+                                 kwargs={"ignore_errors": True}, daemon=True).start()
                 log_to_sublog(self.project_dir, "debug_tools.log", 
                              f"Successfully cleared vector DB: {self.vector_db_dir}")
                 return True
@@ -356,41 +357,36 @@ class DebugTools:
                 log_to_sublog(self.project_dir, "debug_tools.log", 
                              f"❌ Retriever has no vectorstore attribute")
             
-            # Use the actual retriever to get documents
-            log_to_sublog(self.project_dir, "debug_tools.log", 
-                         f"Calling retriever.get_relevant_documents(query='{query}', k=5)...")
-            docs = retriever.get_relevant_documents(query, k=5)
-            
-            log_to_sublog(self.project_dir, "debug_tools.log", 
-                         f"Retrieved {len(docs)} documents")
+            # Cached query embedding plus one direct collection query; the retriever is the fallback
+            results = self._direct_retrieval(query)
+            if isinstance(results, dict):
+                return results
             
-            if not docs:
+            if results is None:
+                # Use the actual retriever to get documents
                 log_to_sublog(self.project_dir, "debug_tools.log", 
-                             f"❌ No documents retrieved")
-                return {"error": "No documents retrieved"}
+                             f"Calling retriever.get_relevant_documents(query='{query}', k=5)...")
+                docs = retriever.get_relevant_documents(query, k=5)
             
-            # Process results
-            results = []
-            for i, doc in enumerate(docs, 1):
                 log_to_sublog(self.project_dir, "debug_tools.log", 
-                             f"Processing document {i}: {type(doc)}")
-                
-                # Safely get metadata
-                metadata = getattr(doc, 'metadata', {})
-                if not isinstance(metadata, dict):
-                    metadata = {}
+                             f"Retrieved {len(docs)} documents")
+            
+                if not docs:
+                    log_to_sublog(self.project_dir, "debug_tools.log", 
+                                 f"❌ No documents retrieved")
+                    return {"error": "No documents retrieved"}
+            
+                # Process results
+                results = []
+                for i, doc in enumerate(docs, 1):
+                    log_to_sublog(self.project_dir, "debug_tools.log", 
+                                 f"Processing document {i}: {type(doc)}")
                 
-                result = {
-                    "rank": i,
-                    "source": metadata.get("source", "Unknown") if isinstance(metadata, dict) else "Unknown",
-                    "content": getattr(doc, 'page_content', '')[:200] + "..." if len(getattr(doc, 'page_content', '')) > 200 else getattr(doc, 'page_content', ''),
-                    "metadata": metadata,
-                    "relevance_score": metadata.get('score', 'N/A') if isinstance(metadata, dict) else 'N/A'
-                }
-                results.append(result)
+                    result = self._format_retrieval_result(i, getattr(doc, 'page_content', ''), getattr(doc, 'metadata', {}))
+                    results.append(result)
                 
-                log_to_sublog(self.project_dir, "debug_tools.log", 
-                             f"Result {i}: {result['source']} (score: {result['relevance_score']})")
+                    log_to_sublog(self.project_dir, "debug_tools.log", 
+                                 f"Result {i}: {result['source']} (score: {result['relevance_score']})")
             
             log_to_sublog(self.project_dir, "debug_tools.log", 
                          f"=== RETRIEVAL TEST COMPLETED SUCCESSFULLY: {len(results)} results ===")
@@ -408,17 +404,157 @@ class DebugTools:
                          f"Traceback: {traceback.format_exc()}")
             return {"error": str(e)}
     
+    def iter_retrieval(self, query, k=5):
+        """Yield retrieval results one at a time so callers can render them as they are produced.
+        
+        A retrieval failure is yielded as a single {"error": ...} dict; raises RuntimeError when no
+        retriever is available.
+        """
+        retriever = self._get_retriever()
+        if not retriever:
+            raise RuntimeError("No retriever available - RAG system not ready")
+        
+        log_to_sublog(self.project_dir, "debug_tools.log", f"Streaming retrieval for query: {query}")
+        results = self._direct_retrieval(query, k)
+        if isinstance(results, dict):
+            yield results
+            return
+        if results is not None:
+            yield from results
+            return
+        docs = retriever.get_relevant_documents(query, k=k)
+        for i, doc in enumerate(docs, 1):
+            yield self._format_retrieval_result(i, getattr(doc, 'page_content', ''), getattr(doc, 'metadata', {}))
+    
+    def _format_retrieval_result(self, rank, content, metadata, score=None):
+        """Build the result dict shared by single and batched retrieval tests."""
+        # Safely get metadata
+        if not isinstance(metadata, dict):
+            metadata = {}
+        content = content or ''
+        return {
+            "rank": rank,
+            "source": metadata.get("source", "Unknown"),
+            "content": content[:200] + "..." if len(content) > 200 else content,
+            "metadata": metadata,
+            "relevance_score": metadata.get('score', 'N/A') if score is None else score
+        }
+    
+    def _relevance_scores(self, distances, collection):
+        """Convert a (queries, k) distance matrix to relevance scores in one vectorized step.
+        
+        Uses the same per-space formulas as LangChain's Chroma wrapper; returns None for ragged results.
+        """
+        import numpy as np
+        try:
+            d = np.asarray(distances, dtype=np.float32)
+        except (TypeError, ValueError):
+            return None
+        if d.ndim != 2:
+            return None
+        space = (getattr(collection, 'metadata', None) or {}).get("hnsw:space", "l2")
+        if space == "cosine":
+            scores = 1.0 - d
+        elif space == "ip":
+            scores = np.where(d > 0, 1.0 - d, -d)
+        else:
+            scores = 1.0 - d / np.sqrt(2)
+        return scores.round(4).tolist()
+    
+    def _direct_retrieval(self, query, k=5):
+        """Single-query _batch_retrieval: a result list, an error dict, or None to fall back to the retriever."""
+        try:
+            batched = self._batch_retrieval((query,), k)
+        except Exception as e:
+            log_to_sublog(self.project_dir, "debug_tools.log", 
+                         f"Direct collection query failed, falling back to the retriever: {e}")
+            return None
+        return batched.get(query) if batched else None
+    
+    def _batch_retrieval(self, queries, k=5):
+        """Embed all queries in one call and run a single multi-query collection lookup.
+        
+        Returns None when the retriever does not expose a Chroma collection and embeddings.
+        """
+        retriever = self._get_retriever()
+        vectorstore = getattr(retriever, 'vectorstore', None)
+        embeddings = getattr(vectorstore, 'embeddings', None)
+        collection = getattr(vectorstore, '_collection', None)
+        if embeddings is None or collection is None:
+            return None
+        
+        query_embeddings = self._probe_query_embeddings(embeddings, queries)
+        # Older chromadb releases only validate list embeddings
+        raw = collection.query(query_embeddings=query_embeddings.tolist(), n_results=k,
+                               include=["documents", "metadatas", "distances"])
+        scores = self._relevance_scores(raw.get('distances'), collection) or [[None] * k for _ in queries]
+        
+        results = {}
+        for query, documents, metadatas, query_scores in zip(queries, raw.get('documents') or [],
+                                                             raw.get('metadatas') or [], scores):
+            if not documents:
+                results[query] = {"error": "No documents retrieved"}
+                continue
+            results[query] = [
+                self._format_retrieval_result(rank, content, metadata, score)
+                for rank, (content, metadata, score) in enumerate(zip(documents, metadatas, query_scores), 1)
+            ]
+        return results
+    
+    def _probe_query_embeddings(self, embeddings, queries):
+        """Query embeddings for probe texts, shared by every debug button through the per-text cache."""
+        model, endpoint = _embedding_cache_key(embeddings)
+        if model is None or endpoint is None:
+            # Not an Ollama client; nothing to key the cache on
+            import numpy as np
+            return np.asarray([embeddings.embed_query(query) for query in queries], dtype=np.float32)
+        return _cached_embed_documents(model, endpoint, tuple(queries))
+    
+    def _parallel_retrieval(self, queries, k=5):
+        """Run the retriever for each query concurrently on a shared pool, keeping results in query order.
+        
+        Session state is only read here on the script thread; the workers just call the retriever.
+        """
+        retriever = self._get_retriever()
+        if not retriever:
+            return {query: {"error": "No retriever available - RAG system not ready"} for query in queries}
+        
+        def retrieve(query):
+            try:
+                return retriever.get_relevant_documents(query, k=k)
+            except Exception as e:
+                return e
+        
+        results = {}
+        for query, docs in zip(queries, _retrieval_pool().map(retrieve, queries)):
+            if isinstance(docs, Exception):
+                log_to_sublog(self.project_dir, "debug_tools.log", f"Retrieval failed for query '{query}': {docs}")
+                results[query] = {"error": str(docs)}
+            elif not docs:
+                results[query] = {"error": "No documents retrieved"}
+            else:
+                results[query] = [
+                    self._format_retrieval_result(rank, getattr(doc, 'page_content', ''), getattr(doc, 'metadata', {}))
+                    for rank, doc in enumerate(docs, 1)
+                ]
+        return results
+    
     def test_multiple_queries(self, queries):
         """Test multiple queries and return results."""
         try:
-            results = {}
             log_to_sublog(self.project_dir, "debug_tools.log", 
                          f"Testing multiple queries: {len(queries)} queries")
             
-            for i, query in enumerate(queries, 1):
+            # One embedding call and one collection query for the whole batch
+            try:
+                results = self._batch_retrieval(queries)
+            except Exception as e:
                 log_to_sublog(self.project_dir, "debug_tools.log", 
-                             f"Testing query {i}/{len(queries)}: {query}")
-                results[query] = self.test_retrieval(query)
+                             f"Batched retrieval failed, falling back to per-query retrieval: {e}")
+                results = None
+            
+            if results is None:
+                results = self._parallel_retrieval(queries)
             
             log_to_sublog(self.project_dir, "debug_tools.log", 
                          f"Multiple query testing completed: {len(results)} results")
@@ -514,13 +650,11 @@ class DebugTools:
                             # Display file breakdown
                             if "file_distribution" in stats:
                                 st.subheader("📁 File Distribution")
-                                file_data = []
-                                for file_path, count in stats["file_distribution"].items():
-                                    file_data.append({"File": file_path, "Chunks": count})
+                                file_data = Counter(stats["file_distribution"]).most_common()
                                 
                                 if file_data:
                                     import pandas as pd
-                                    df = pd.DataFrame(file_data)
+                                    df = pd.DataFrame(file_data, columns=["File", "Chunks"])
                                     st.dataframe(df, use_container_width=True)
                         else:
                             st.error(f"❌ Error inspecting vector DB: {stats.get('error')}")
@@ -556,11 +690,15 @@ class DebugTools:
                             st.subheader(f"📄 Chunks for: {selected_file}")
                             st.write(f"Found {len(chunks)} chunks")
                             
-                            # Display chunks
+                            # Display chunks; the preview is a slice of the content, highlighted by file extension
+                            language = os.path.splitext(selected_file)[1].lstrip('.') or 'text'
                             for i, chunk in enumerate(chunks):
+                                content = chunk.get('content', '')
                                 with st.expander(f"Chunk {i+1}: {chunk.get('type', 'unknown')} (lines {chunk.get('start_line', 0)}-{chunk.get('end_line', 0)})"):
                                     st.write("**Content:**")
-                                    st.code(chunk.get('content', '')[:500] + "..." if len(chunk.get('content', '')) > 500 else chunk.get('content', ''))
+                                    st.code(content[:500], language=language)
+                                    if len(content) > 500:
+                                        st.caption(f"Showing first 500 of {len(content)} characters")
                                     
                                     st.write("**Metadata:**")
                                     st.json(chunk.get('metadata', {}))
@@ -655,6 +793,35 @@ class DebugTools:
                     else:
                         st.error(f"❌ Error generating debug report: {report.get('error')}")
 
+@st.cache_resource(show_spinner=False)
+def _retrieval_pool():
+    """Process-wide pool for I/O-bound per-query retrieval fallbacks (embedding HTTP calls + Chroma reads)."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="debug-retrieval")
+
+def _embedding_cache_key(embeddings):
+    """(model, endpoint) identifying an embeddings client, for keying cached embeddings."""
+    return getattr(embeddings, 'model', None), getattr(embeddings, 'base_url', None)
+
+@lru_cache(maxsize=4)
+def _query_embedder(model, endpoint):
+    """One OllamaEmbeddings client per (model, endpoint) for _cached_embed_query."""
+    from langchain_ollama import OllamaEmbeddings
+    return OllamaEmbeddings(model=model, base_url=endpoint)
+
+# A plain lru_cache rather than st.cache_data: pool workers have no ScriptRunContext. Vectors are kept
+# as float32 arrays, which Chroma indexes in anyway
+@lru_cache(maxsize=512)
+def _cached_embed_query(model, endpoint, text):
+    """embed_query memoized on (model, endpoint, text) for the life of the process."""
+    import numpy as np
+    return np.asarray(_query_embedder(model, endpoint).embed_query(text), dtype=np.float32)
+
+def _cached_embed_documents(model, endpoint, texts):
+    """Query embeddings for several texts, cache misses embedded concurrently on the shared pool."""
+    import numpy as np
+    embed = partial(_cached_embed_query, model, endpoint)
+    return np.asarray(list(_retrieval_pool().map(embed, texts)), dtype=np.float32)
+
 # Legacy functions for backward compatibility
 def load_documents_from_vector_db(vector_db_dir):
     """Loads all Document metadata for inspection/debugging."""
@@ -714,6 +881,13 @@ def surface_anchorless_chunks(vector_db_dir, required_anchors=None):
     
     return anchorless
 
+# Generated/vendored directories skipped by the project structure overview (hidden dirs are skipped too)
+_SKIP_DIRS = frozenset({"node_modules", "__pycache__", "build", "dist", "venv"})
+
+def _skip_dir(entry):
+    """Prune hidden and _SKIP_DIRS directories from the project structure walk."""
+    return entry.name.startswith('.') or entry.name in _SKIP_DIRS
+
 def show_debug_tools(project_dir, vector_db_dir):
     """Entry point: Display main debug tools panel."""
     log_highlight("debug_tools.show_debug_tools")
@@ -747,13 +921,7 @@ def show_debug_tools(project_dir, vector_db_dir):
 
     # 3. Quick project structure summary
     st.subheader("🗂️ Project Structure Overview")
-    files_by_type = {}
-    for root, dirs, files in os.walk(project_dir):
-        for file in files:
-            ext = os.path.splitext(file)[1].lower()
-            files_by_type.setdefault(ext, 0)
-            files_by_type[ext] += 1
-    for ext, count in sorted(files_by_type.items(), key=lambda x: -x[1]):
-        st.write(f"{ext or '[no ext]'}: {count} files")
+    files_by_type = Counter(os.path.splitext(entry.name)[1].lower() for entry in iter_files(project_dir, prune=_skip_dir))
+    st.markdown("\n".join(f"- {ext or '[no ext]'}: {count} files" for ext, count in files_by_type.most_common()))
 
     st.success("RAG debugging complete.")
@@ -53,8 +53,8 @@ def inspect_vector_db(project_config, retriever=None):
         file_types[file_type]["size_mb"] += file_info["size_mb"]
     
     st.write("**Files by type:**")
-    for file_type, info in file_types.items():
-        st.write(f"  • {file_type}: {info['count']} files ({info['size_mb']:.2f} MB)")
+    st.markdown("\n".join(f"- {file_type}: {info['count']} files ({info['size_mb']:.2f} MB)"
+                          for file_type, info in file_types.items()))
     
     # Check critical files
     critical_files = {